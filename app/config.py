@@ -1,3 +1,4 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings
 from typing import Optional
 import os
@@ -30,6 +31,8 @@ class Settings(BaseSettings):
     
     # Google Drive Storage
     google_drive_folder_id: str
+    # Resumable upload chunk size in MiB; rejected at startup unless positive
+    gdrive_chunk_mb: int = Field(32, gt=0)
     
     # File Management - Using platform-agnostic paths
     # These will now be properly resolved for any operating system
@@ -9,21 +9,31 @@ This module provides functionality for Google Drive operations, including:
 """
 
 import os
+import io
+import asyncio
+import inspect
+import mmap
 import json
 import time
 import logging
-import gc
-from typing import Optional, Dict, Any, List, Tuple
+import queue
+import threading
+import functools
+import hashlib
+import mimetypes
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple, Iterator, Callable
 from pathlib import Path
 
 import google.oauth2.credentials
 from google.oauth2 import service_account
-from google.auth.transport.requests import Request
+from google.auth.transport.requests import Request, AuthorizedSession
 from google.auth.exceptions import RefreshError
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaFileUpload
+
+# The discovery client, media upload helpers, HTTP transport and OAuth flow
+# pull in large dependency graphs, so they are imported lazily where they are used.
 
 from app.config import settings
 
@@ -39,6 +49,285 @@ SCOPES = [
     'https://www.googleapis.com/auth/drive'
 ]
 
+# Path to store token cache (for refreshing OAuth tokens), resolved once at import time
+_TOKEN_CACHE_DIR = Path(__file__).resolve().parents[2] / 'tmp' / 'tokens'
+_TOKEN_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+_TOKEN_PATH = _TOKEN_CACHE_DIR / 'google_token.json'
+
+# OAuth tokens are refreshed in the background once they are this close to expiry
+_PREEMPTIVE_REFRESH_WINDOW = datetime.timedelta(minutes=5)
+
+
+class _BackgroundRefreshCredentials(google.oauth2.credentials.Credentials):
+    """
+    OAuth user credentials that refresh themselves ahead of expiry.
+    
+    When a request is made within _PREEMPTIVE_REFRESH_WINDOW of the token's
+    expiry, the current (still valid) token is used and a refresh is started
+    on a background thread, so Drive calls don't stall on the token endpoint.
+    At most one background refresh is in flight at a time.
+    """
+    
+    _refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='gdrive-token-refresh')
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.token_path: Optional[str] = None
+        self._refreshing = threading.Event()
+    
+    def before_request(self, request, method, url, headers):
+        if (self.valid and self.expiry is not None and self.refresh_token
+                and not self._refreshing.is_set()):
+            now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+            if self.expiry - now < _PREEMPTIVE_REFRESH_WINDOW:
+                self._refreshing.set()
+                self._refresh_executor.submit(self._background_refresh)
+        super().before_request(request, method, url, headers)
+    
+    def _background_refresh(self) -> None:
+        """Refresh the token and persist it to the token cache."""
+        try:
+            self.refresh(Request())
+            if self.token_path:
+                with open(self.token_path, 'w') as token:
+                    token.write(self.to_json())
+            logger.info("Refreshed Google OAuth token in the background")
+        except Exception as e:
+            logger.warning(f"Background OAuth token refresh failed: {e}")
+        finally:
+            self._refreshing.clear()
+
+
+# Authenticated Drive services shared across the process, keyed by
+# (scopes, credentials fingerprint)
+_service_cache: Dict[Tuple[frozenset, str], Any] = {}
+_service_cache_lock = threading.Lock()
+
+
+def _credentials_fingerprint(credentials) -> str:
+    """
+    Compute a stable fingerprint identifying the principal behind credentials.
+    
+    Args:
+        credentials: Google auth credentials
+        
+    Returns:
+        str: SHA-256 hex digest of the principal identity and scopes
+    """
+    identity = getattr(credentials, 'service_account_email', None)
+    if not identity:
+        # OAuth user credentials: the client ID alone is shared by every user
+        identity = f"{getattr(credentials, 'client_id', '')}:{getattr(credentials, 'refresh_token', '')}"
+    return hashlib.sha256(f"{identity}|{' '.join(SCOPES)}".encode()).hexdigest()
+
+
+def _get_cached_service(credentials):
+    """
+    Get the Drive service for the given credentials, building it only once.
+    
+    Args:
+        credentials: Google auth credentials
+        
+    Returns:
+        googleapiclient.discovery.Resource: Drive v3 service client
+    """
+    key = (frozenset(SCOPES), _credentials_fingerprint(credentials))
+    with _service_cache_lock:
+        service = _service_cache.get(key)
+        if service is None:
+            service = _build_drive_service(credentials)
+            _service_cache[key] = service
+    return service
+
+
+# Load the MIME type database once at import rather than on first upload
+mimetypes.init()
+
+
+@functools.lru_cache(maxsize=256)
+def _guess_mime(ext: str) -> str:
+    """
+    Guess the MIME type for a lower-cased file extension (e.g. '.mp4').
+    
+    Args:
+        ext: File extension including the leading dot
+        
+    Returns:
+        str: MIME type, or 'application/octet-stream' if unknown
+    """
+    return mimetypes.types_map.get(ext, 'application/octet-stream')
+
+
+@functools.lru_cache(maxsize=4)
+def _sa_creds(info_str: str, scopes_key: Tuple[str, ...]) -> service_account.Credentials:
+    """
+    Build service account credentials from the GOOGLE_SERVICE_ACCOUNT_INFO JSON string.
+    
+    The environment variable does not change for the lifetime of the process,
+    so the credentials are cached and repeated calls skip the JSON parse and
+    private key loading.
+    
+    Args:
+        info_str: Service account JSON string
+        scopes_key: OAuth scopes as a tuple
+        
+    Returns:
+        service_account.Credentials: Service account credentials
+        
+    Raises:
+        json.JSONDecodeError: If info_str is not valid JSON
+    """
+    return service_account.Credentials.from_service_account_info(
+        json.loads(info_str), scopes=list(scopes_key))
+
+
+# Resumable upload chunks must be a multiple of 256 KiB
+# https://developers.google.com/drive/api/guides/manage-uploads#resumable
+UPLOAD_CHUNK_ALIGNMENT = 256 * 1024
+
+# Drive REST endpoint for starting resumable uploads, used by upload_file_async
+RESUMABLE_UPLOAD_URL = 'https://www.googleapis.com/upload/drive/v3/files'
+
+# File metadata returned after an upload
+UPLOAD_RESPONSE_FIELDS = 'id,name,mimeType,webViewLink,webContentLink,size'
+
+# Maximum number of calls per Drive batch request
+# https://developers.google.com/drive/api/guides/performance#batch-requests
+BATCH_SIZE = 100
+
+# Minimum seconds between upload progress reports; 100% is always reported
+PROGRESS_EMIT_INTERVAL = 2.0
+
+
+# MIME type Drive uses for folders, and the matching query clause
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+_FOLDER_MIME = f"mimeType = '{FOLDER_MIME_TYPE}'"
+
+
+def _q_escape(value: str) -> str:
+    """Escape backslashes and single quotes for use inside a Drive query string literal."""
+    return value.replace("\\", "\\\\").replace("'", "\\'")
+
+
+def _folder_query(folder_name: str, parent_folder_id: Optional[str] = None) -> str:
+    """
+    Build the Drive search query for a folder by name.
+    
+    Args:
+        folder_name: Name of the folder
+        parent_folder_id: ID of the parent folder to search in (optional)
+        
+    Returns:
+        str: Drive files.list query string
+    """
+    if parent_folder_id:
+        return (f"name = '{_q_escape(folder_name)}' and {_FOLDER_MIME} and "
+                f"'{_q_escape(parent_folder_id)}' in parents and trashed = false")
+    return f"name = '{_q_escape(folder_name)}' and {_FOLDER_MIME} and trashed = false"
+
+
+# Folder IDs found or created by find_or_create_folder, keyed on (parent ID, name)
+# and stored with their expiry time, so repeated lookups skip the files.list call
+FOLDER_CACHE_TTL = 600
+FOLDER_CACHE_MAXSIZE = 1024
+_folder_cache: Dict[Tuple[Optional[str], str], Tuple[float, str]] = {}
+_folder_cache_lock = threading.Lock()
+
+
+def _get_cached_folder(key: Tuple[Optional[str], str]) -> Optional[str]:
+    """Return the cached folder ID for a (parent ID, name) key if it hasn't expired."""
+    with _folder_cache_lock:
+        entry = _folder_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _folder_cache[key]
+            return None
+        return entry[1]
+
+
+def _cache_folder(key: Tuple[Optional[str], str], folder_id: str) -> None:
+    """Cache a folder ID for FOLDER_CACHE_TTL seconds, evicting the oldest entry when full."""
+    with _folder_cache_lock:
+        _folder_cache.pop(key, None)
+        if len(_folder_cache) >= FOLDER_CACHE_MAXSIZE:
+            del _folder_cache[next(iter(_folder_cache))]
+        _folder_cache[key] = (time.monotonic() + FOLDER_CACHE_TTL, folder_id)
+
+
+def _invalidate_folder(folder_id: Optional[str]) -> None:
+    """Drop cached entries for a folder (and its children) after Drive reports it missing."""
+    if not folder_id:
+        return
+    with _folder_cache_lock:
+        stale = [key for key, (_, cached_id) in _folder_cache.items()
+                 if cached_id == folder_id or key[0] == folder_id]
+        for key in stale:
+            del _folder_cache[key]
+
+
+# User agent sent with every Drive request. Google only serves gzip-compressed
+# responses when the user agent contains "gzip".
+USER_AGENT = 'frameio-gdrive/1.0 (gzip)'
+
+
+class _SessionHttp:
+    """
+    httplib2-compatible adapter around a pooled requests session.
+    
+    googleapiclient issues requests through an object exposing httplib2's
+    ``request()`` interface. This adapter forwards those calls to a
+    google-auth AuthorizedSession, so TCP and TLS connections are kept
+    alive and reused across Drive calls instead of being re-established.
+    """
+    
+    def __init__(self, session):
+        self.session = session
+    
+    def request(self, uri, method='GET', body=None, headers=None,
+                redirections=5, connection_type=None):
+        import httplib2
+        
+        response = self.session.request(method, uri, data=body, headers=headers)
+        info = {key.lower(): value for key, value in response.headers.items()}
+        info['status'] = str(response.status_code)
+        resp = httplib2.Response(info)
+        resp.reason = response.reason
+        return resp, response.content
+    
+    def close(self):
+        self.session.close()
+
+
+def _build_drive_service(credentials):
+    """
+    Build a Drive v3 service client for the given credentials.
+    
+    Requests go through a pooled, keep-alive AuthorizedSession with retries
+    on connection errors. The client identifies itself with USER_AGENT so
+    large responses such as folder listings are returned gzip-compressed.
+    
+    Args:
+        credentials: Google auth credentials to authorize requests with
+        
+    Returns:
+        googleapiclient.discovery.Resource: Drive v3 service client
+    """
+    from googleapiclient.discovery import build
+    from googleapiclient.http import set_user_agent
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = AuthorizedSession(credentials)
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32,
+                          max_retries=Retry(total=5, backoff_factor=0.5))
+    session.mount('https://', adapter)
+    
+    http = set_user_agent(_SessionHttp(session), USER_AGENT)
+    # Use the discovery document bundled with google-api-python-client rather
+    # than fetching it over HTTP on every cold start
+    return build('drive', 'v3', http=http, cache_discovery=False, static_discovery=True)
+
 
 class GoogleDriveService:
     """
@@ -46,21 +335,50 @@ class GoogleDriveService:
     
     This class provides methods for authenticating with Google Drive and
     performing operations such as uploading files and generating share links.
+    
+    All instances share their state (Borg pattern), so the authenticated
+    credentials and Drive service are created once per process and reused
+    by every caller.
     """
     
-    def __init__(self):
-        """Initialize the GoogleDriveService."""
-        self.credentials = None
-        self.service = None
-        self.target_folder_id = settings.google_drive_folder_id
+    # State shared by every instance in the process
+    _shared_state: Dict[str, Any] = {}
+    
+    # Guards authenticate() so only one caller runs the auth flow
+    _auth_lock = threading.Lock()
+    
+    def __init__(self, service=None):
+        """
+        Initialize the GoogleDriveService.
         
-        # Path to store token cache (for refreshing OAuth tokens)
-        self.token_cache_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
-                                           'tmp', 'tokens')
-        self.token_path = os.path.join(self.token_cache_dir, 'google_token.json')
+        Instances normally share their state. An instance given a pre-built service
+        gets its own copy of the state instead, so the injected service (e.g. a
+        test stub) never replaces the one used by the rest of the process.
+        
+        Args:
+            service: Optional pre-built Drive service for this instance to use
+                instead of authenticating
+        """
+        self.__dict__ = self._shared_state
+        if not self._shared_state:
+            self.credentials = None
+            self.service = None
+            self.target_folder_id = settings.google_drive_folder_id
+            
+            # Settings read on every upload or authentication, captured once
+            self._client_id = settings.google_client_id
+            self._client_secret = settings.google_client_secret
+            self._redirect_uri = settings.google_redirect_uri
+            self._default_chunk_size = settings.gdrive_chunk_mb * 1024 * 1024
+            
+            # Token cache locations are computed once at module import
+            self.token_cache_dir = str(_TOKEN_CACHE_DIR)
+            self.token_path = str(_TOKEN_PATH)
         
-        # Create token cache directory if it doesn't exist
-        os.makedirs(self.token_cache_dir, exist_ok=True)
+        if service is not None:
+            # Detach from the shared state before storing the injected service
+            self.__dict__ = dict(self._shared_state)
+            self.service = service
     
     def authenticate_with_oauth(self) -> bool:
         """
@@ -76,7 +394,7 @@ class GoogleDriveService:
             # Check if we already have a valid token
             if os.path.exists(self.token_path):
                 with open(self.token_path, 'r') as token:
-                    self.credentials = google.oauth2.credentials.Credentials.from_authorized_user_info(
+                    self.credentials = _BackgroundRefreshCredentials.from_authorized_user_info(
                         json.load(token), SCOPES)
                 
                 # If credentials are expired and there's a refresh token, refresh them
@@ -93,32 +411,39 @@ class GoogleDriveService:
             # If there are no (valid) credentials, create from environment variables
             if not self.credentials or not self.credentials.valid:
                 # Check if required environment variables are available
-                if not (settings.google_client_id and settings.google_client_secret):
+                if not (self._client_id and self._client_secret):
                     logger.error("Missing Google OAuth credentials in environment variables")
                     return False
                 
                 # Create client config from environment variables
                 client_config = {
                     "installed": {
-                        "client_id": settings.google_client_id,
-                        "client_secret": settings.google_client_secret,
-                        "redirect_uris": [settings.google_redirect_uri, "http://localhost"],
+                        "client_id": self._client_id,
+                        "client_secret": self._client_secret,
+                        "redirect_uris": [self._redirect_uri, "http://localhost"],
                         "auth_uri": "https://accounts.google.com/o/oauth2/auth",
                         "token_uri": "https://oauth2.googleapis.com/token"
                     }
                 }
                 
                 # Run the OAuth flow
+                from google_auth_oauthlib.flow import InstalledAppFlow
                 flow = InstalledAppFlow.from_client_config(
-                    client_config, SCOPES, redirect_uri=settings.google_redirect_uri)
-                self.credentials = flow.run_local_server(port=0)
+                    client_config, SCOPES, redirect_uri=self._redirect_uri)
+                flow_credentials = flow.run_local_server(port=0)
                 
                 # Save the credentials for future use
                 with open(self.token_path, 'w') as token:
-                    token.write(self.credentials.to_json())
+                    token.write(flow_credentials.to_json())
+                
+                self.credentials = _BackgroundRefreshCredentials.from_authorized_user_info(
+                    json.loads(flow_credentials.to_json()), SCOPES)
+            
+            # Refreshed tokens are persisted back to the token cache
+            self.credentials.token_path = self.token_path
             
             # Build the service
-            self.service = build('drive', 'v3', credentials=self.credentials)
+            self.service = _get_cached_service(self.credentials)
             logger.info("Successfully authenticated with Google Drive using OAuth")
             return True
             
@@ -145,18 +470,14 @@ class GoogleDriveService:
                 return False
             
             try:
-                # Parse the JSON string from environment variable
-                service_account_info = json.loads(service_account_info_str)
+                # Authenticate using service account info from environment variable
+                self.credentials = _sa_creds(service_account_info_str, tuple(SCOPES))
             except json.JSONDecodeError:
                 logger.error("Failed to parse GOOGLE_SERVICE_ACCOUNT_INFO as JSON")
                 return False
             
-            # Authenticate using service account info from environment variable
-            self.credentials = service_account.Credentials.from_service_account_info(
-                service_account_info, scopes=SCOPES)
-            
             # Build the service
-            self.service = build('drive', 'v3', credentials=self.credentials)
+            self.service = _get_cached_service(self.credentials)
             logger.info("Successfully authenticated with Google Drive using service account")
             return True
             
@@ -178,30 +499,38 @@ class GoogleDriveService:
         if self.service:
             logger.info("Already authenticated with Google Drive")
             return True
+        
+        # Serialize authentication so concurrent callers don't all run the auth flow
+        with self._auth_lock:
+            # Another caller may have authenticated while we were waiting
+            if self.service:
+                logger.info("Already authenticated with Google Drive")
+                return True
+                
+            # Try to get service account credentials from file first
+            service_account_path = settings.get_service_account_path()
+            if service_account_path and os.path.exists(service_account_path):
+                logger.info(f"Using service account file: {service_account_path}")
+                try:
+                    self.credentials = service_account.Credentials.from_service_account_file(
+                        service_account_path, scopes=SCOPES)
+                    self.service = _get_cached_service(self.credentials)
+                    logger.info("Successfully authenticated with Google Drive using service account file")
+                    return True
+                except Exception as e:
+                    logger.error(f"Error authenticating with service account file: {e}")
             
-        # Try to get service account credentials from file first
-        service_account_path = settings.get_service_account_path()
-        if service_account_path and os.path.exists(service_account_path):
-            logger.info(f"Using service account file: {service_account_path}")
-            try:
-                self.credentials = service_account.Credentials.from_service_account_file(
-                    service_account_path, scopes=SCOPES)
-                self.service = build('drive', 'v3', credentials=self.credentials)
-                logger.info("Successfully authenticated with Google Drive using service account file")
+            # Try service account authentication from environment variable
+            if self.authenticate_with_service_account():
                 return True
-            except Exception as e:
-                logger.error(f"Error authenticating with service account file: {e}")
-        
-        # Try service account authentication from environment variable
-        if self.authenticate_with_service_account():
-            return True
-        
-        # Fall back to OAuth authentication
-        logger.info("Service account authentication failed, falling back to OAuth")
-        return self.authenticate_with_oauth()
+            
+            # Fall back to OAuth authentication
+            logger.info("Service account authentication failed, falling back to OAuth")
+            return self.authenticate_with_oauth()
     
     def upload_file(self, file_path: str, folder_id: Optional[str] = None, name: Optional[str] = None, 
-                   mime_type: Optional[str] = None, chunk_size: int = 5 * 1024 * 1024) -> Optional[Dict[str, Any]]:
+                   mime_type: Optional[str] = None, chunk_size: Optional[int] = None,
+                   progress_callback: Optional[Callable[[int], None]] = None) -> Optional[Dict[str, Any]]:
         """
         Upload a file to Google Drive with support for shared drives.
         
@@ -210,37 +539,51 @@ class GoogleDriveService:
             folder_id: ID of the folder to upload to (default: target folder ID)
             name: Name to give the file in Google Drive (default: file's basename)
             mime_type: MIME type of the file (default: auto-detect)
-            chunk_size: Chunk size in bytes for resumable uploads (default: 5MB)
+            chunk_size: Chunk size in bytes for resumable uploads, must be a multiple
+                of 256 KiB (default: settings.gdrive_chunk_mb, 32 MiB)
+            progress_callback: Called with the upload percentage, at most once every
+                PROGRESS_EMIT_INTERVAL seconds and always at 100%
             
         Returns:
             Optional[Dict[str, Any]]: File metadata if upload was successful, None otherwise
+            
+        Raises:
+            ValueError: If chunk_size is not a multiple of 256 KiB
         """
+        if chunk_size is None:
+            chunk_size = self._default_chunk_size
+        if chunk_size <= 0 or chunk_size % UPLOAD_CHUNK_ALIGNMENT:
+            raise ValueError(f"chunk_size must be a positive multiple of {UPLOAD_CHUNK_ALIGNMENT} bytes")
+        
         if not self.service:
             if not self.authenticate():
                 logger.error("Failed to authenticate with Google Drive")
                 return None
         
+        # Memory map and file descriptor backing the upload, released in finally
+        fd = None
+        mapped = None
+        
         try:
-            # Validate file exists
-            if not os.path.exists(file_path):
+            # Validate file exists and get its size with a single stat call
+            try:
+                file_stat = os.stat(file_path)
+            except FileNotFoundError:
                 logger.error(f"File not found: {file_path}")
                 return None
+            file_size = file_stat.st_size
             
             # Use file's basename if name not provided
             if not name:
-                name = os.path.basename(file_path)
+                name = Path(file_path).name
                 
             # Use target folder if folder_id not provided
             if not folder_id:
                 folder_id = self.target_folder_id
             
-            # Get file size for logging
-            file_size = os.path.getsize(file_path)
-            
             # Try to determine mime type if not provided
             if not mime_type:
-                import mimetypes
-                mime_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+                mime_type = _guess_mime(os.path.splitext(name)[1].lower())
             
             # Create file metadata
             file_metadata = {
@@ -251,9 +594,23 @@ class GoogleDriveService:
             if folder_id:
                 file_metadata['parents'] = [folder_id]
             
+            # Memory-map the file so chunks are sliced straight from the page
+            # cache instead of going through a buffered file object
+            from googleapiclient.http import MediaIoBaseUpload
+            if file_size > 0:
+                fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+                mapped = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+                # Chunks are read front to back once: ask for aggressive readahead
+                if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                source = mapped
+            else:
+                # Zero-length files cannot be memory-mapped
+                source = io.BytesIO()
+            
             # Create media with appropriate chunk size for large files
-            media = MediaFileUpload(
-                file_path,
+            media = MediaIoBaseUpload(
+                source,
                 mimetype=mime_type,
                 resumable=True,  # Enable resumable uploads for large files
                 chunksize=chunk_size  # Use specified chunk size
@@ -269,23 +626,31 @@ class GoogleDriveService:
             request = self.service.files().create(
                 body=file_metadata,
                 media_body=media,
-                fields='id,name,mimeType,webViewLink,webContentLink,size',
+                fields=UPLOAD_RESPONSE_FIELDS,
                 supportsAllDrives=True,  # For Shared Drives
                 supportsTeamDrives=True  # For backward compatibility
             )
             
             # Execute the request with progress tracking
             response = None
-            last_progress = 0
+            last_emit = 0.0
             
-            # Process the upload in chunks with progress updates
+            # Process the upload in chunks, reporting progress at most every PROGRESS_EMIT_INTERVAL
             while response is None:
                 status, response = request.next_chunk()
-                if status:
+                if response is not None:
+                    progress = 100
+                elif status:
                     progress = int(status.progress() * 100)
-                    if progress - last_progress >= 5:  # Log every 5% change
-                        logger.info(f"Upload progress: {progress}%")
-                        last_progress = progress
+                else:
+                    continue
+                
+                now = time.monotonic()
+                if progress == 100 or now - last_emit >= PROGRESS_EMIT_INTERVAL:
+                    logger.info(f"Upload progress: {progress}%")
+                    if progress_callback:
+                        progress_callback(progress)
+                    last_emit = now
             
             file = response
             
@@ -300,31 +665,255 @@ class GoogleDriveService:
             return file
             
         except HttpError as e:
+            if e.resp.status == 404:
+                # The target folder is gone - don't hand out its cached ID again
+                _invalidate_folder(folder_id)
             logger.error(f"HTTP error during file upload: {e}")
             return None
         except Exception as e:
             logger.error(f"Error uploading file to Google Drive: {e}")
             return None
         finally:
-            # Clean up the media object to prevent file handle leaks
-            if 'media' in locals() and media is not None:
-                try:
-                    # Check if _fd attribute exists and close it 
-                    if hasattr(media, '_fd'):
-                        try:
-                            media._fd.close()
-                            logger.info("MediaFileUpload internal file handle explicitly closed")
-                        except Exception as e:
-                            logger.warning(f"Error closing MediaFileUpload file handle: {e}")
+            # Release the memory map and file descriptor to prevent file handle leaks
+            try:
+                if mapped is not None:
+                    mapped.close()
+                if fd is not None:
+                    os.close(fd)
+            except Exception as e:
+                logger.warning(f"Error releasing upload file handle: {e}")
+    
+    def _get_access_token(self) -> Optional[str]:
+        """
+        Get a valid access token for calling the Drive REST API directly.
+        
+        Returns:
+            Optional[str]: Access token, None if there are no credentials
+        """
+        if not self.credentials:
+            return None
+        if not self.credentials.valid:
+            self.credentials.refresh(Request())
+        return self.credentials.token
+    
+    async def _start_resumable(self, client, metadata: Dict[str, Any], mime_type: str,
+                               file_size: int, token: str) -> str:
+        """
+        Start a resumable upload session.
+        
+        Args:
+            client: httpx.AsyncClient to send the request with
+            metadata: File metadata (name, parents)
+            mime_type: MIME type of the file
+            file_size: Size of the file in bytes
+            token: Access token
+            
+        Returns:
+            str: Session URI the file content is sent to
+        """
+        response = await client.post(
+            RESUMABLE_UPLOAD_URL,
+            params={
+                'uploadType': 'resumable',
+                'supportsAllDrives': 'true',
+                'fields': UPLOAD_RESPONSE_FIELDS
+            },
+            headers={
+                'Authorization': f'Bearer {token}',
+                'X-Upload-Content-Type': mime_type,
+                'X-Upload-Content-Length': str(file_size)
+            },
+            json=metadata
+        )
+        response.raise_for_status()
+        return response.headers['Location']
+    
+    async def upload_file_async(self, file_path: str, folder_id: Optional[str] = None,
+                                name: Optional[str] = None, mime_type: Optional[str] = None,
+                                chunk_size: Optional[int] = None,
+                                progress_callback: Optional[Callable[[int], Any]] = None,
+                                client=None) -> Optional[Dict[str, Any]]:
+        """
+        Upload a file to Google Drive without blocking the event loop.
+        
+        Speaks the resumable upload protocol directly over httpx and reads the
+        file with aiofiles, so many uploads can run concurrently in one worker.
+        
+        Args:
+            file_path: Path to the file to upload
+            folder_id: ID of the folder to upload to (default: target folder ID)
+            name: Name to give the file in Google Drive (default: file's basename)
+            mime_type: MIME type of the file (default: auto-detect)
+            chunk_size: Chunk size in bytes, must be a multiple of 256 KiB
+                (default: settings.gdrive_chunk_mb, 32 MiB)
+            progress_callback: Called (or awaited, if it returns an awaitable) with the
+                upload percentage, at most once every PROGRESS_EMIT_INTERVAL seconds
+                and always at 100%
+            client: Shared httpx.AsyncClient to reuse connections across uploads
+                (default: a client for this upload only)
+            
+        Returns:
+            Optional[Dict[str, Any]]: File metadata if upload was successful, None otherwise
+            
+        Raises:
+            ValueError: If chunk_size is not a multiple of 256 KiB
+        """
+        import httpx
+        import aiofiles
+        
+        if chunk_size is None:
+            chunk_size = self._default_chunk_size
+        if chunk_size <= 0 or chunk_size % UPLOAD_CHUNK_ALIGNMENT:
+            raise ValueError(f"chunk_size must be a positive multiple of {UPLOAD_CHUNK_ALIGNMENT} bytes")
+        
+        if not self.service:
+            if not await asyncio.to_thread(self.authenticate):
+                logger.error("Failed to authenticate with Google Drive")
+                return None
+        
+        async def report(progress: int) -> None:
+            logger.info(f"Upload progress: {progress}%")
+            if progress_callback:
+                result = progress_callback(progress)
+                if inspect.isawaitable(result):
+                    await result
+        
+        owns_client = client is None
+        
+        try:
+            # Validate file exists and get its size
+            try:
+                file_size = (await asyncio.to_thread(os.stat, file_path)).st_size
+            except FileNotFoundError:
+                logger.error(f"File not found: {file_path}")
+                return None
+            
+            # Use file's basename if name not provided
+            if not name:
+                name = Path(file_path).name
+            
+            # Use target folder if folder_id not provided
+            if not folder_id:
+                folder_id = self.target_folder_id
+            
+            # Try to determine mime type if not provided
+            if not mime_type:
+                mime_type = _guess_mime(os.path.splitext(name)[1].lower())
+            
+            file_metadata = {'name': name}
+            if folder_id:
+                file_metadata['parents'] = [folder_id]
+            
+            token = await asyncio.to_thread(self._get_access_token)
+            if not token:
+                logger.error("No Google Drive credentials available for upload")
+                return None
+            
+            if owns_client:
+                client = httpx.AsyncClient(
+                    headers={'User-Agent': USER_AGENT},
+                    timeout=httpx.Timeout(120.0, connect=10.0),
+                    limits=httpx.Limits(max_connections=32)
+                )
+            
+            start_time = time.time()
+            logger.info(f"Uploading file: {file_path} ({file_size/1024/1024:.2f} MB, {mime_type}) to Google Drive")
+            
+            session_uri = await self._start_resumable(client, file_metadata, mime_type, file_size, token)
+            
+            offset = 0
+            last_emit = 0.0
+            async with aiofiles.open(file_path, 'rb') as f:
+                while True:
+                    await f.seek(offset)
+                    chunk = await f.read(chunk_size)
+                    if chunk:
+                        content_range = f"bytes {offset}-{offset + len(chunk) - 1}/{file_size}"
+                    elif file_size == 0:
+                        content_range = "bytes */0"
+                    else:
+                        raise IOError(f"File shrank during upload: {file_path}")
                     
-                    # Force resource cleanup
-                    media_str = str(media)  # Keep reference to log what we're cleaning up
-                    media = None  # Remove our reference
-                    import gc
-                    gc.collect()  # Force garbage collection
-                    logger.info(f"Forced garbage collection to release file handles for {media_str}")
-                except Exception as e:
-                    logger.warning(f"Error during media cleanup: {str(e)}")
+                    # Refreshes the token only when it has expired
+                    token = await asyncio.to_thread(self._get_access_token)
+                    response = await client.put(
+                        session_uri,
+                        content=chunk,
+                        headers={
+                            'Authorization': f'Bearer {token}',
+                            'Content-Range': content_range
+                        }
+                    )
+                    
+                    if response.status_code in (200, 201):
+                        file = response.json()
+                        break
+                    if response.status_code != 308:
+                        response.raise_for_status()
+                        raise IOError(f"Unexpected upload response: {response.status_code}")
+                    
+                    # Continue after the last byte Drive has persisted
+                    persisted = response.headers.get('Range')
+                    offset = int(persisted.rsplit('-', 1)[1]) + 1 if persisted else 0
+                    
+                    now = time.monotonic()
+                    if now - last_emit >= PROGRESS_EMIT_INTERVAL:
+                        await report(int(offset * 100 / file_size))
+                        last_emit = now
+            
+            await report(100)
+            
+            # Calculate upload speed
+            upload_time = time.time() - start_time
+            upload_speed = file_size / upload_time if upload_time > 0 else 0
+            
+            logger.info(f"File uploaded successfully: {file.get('name')} (ID: {file.get('id')})")
+            logger.info(f"Upload time: {upload_time:.2f} seconds ({upload_speed/1024/1024:.2f} MB/s)")
+            
+            return file
+            
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                # The target folder is gone - don't hand out its cached ID again
+                _invalidate_folder(folder_id)
+            logger.error(f"HTTP error during file upload: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Error uploading file to Google Drive: {e}")
+            return None
+        finally:
+            if owns_client and client is not None:
+                await client.aclose()
+    
+    async def upload_files(self, paths: List[str], folder_id: Optional[str] = None,
+                           concurrency: int = 8) -> List[Any]:
+        """
+        Upload several files concurrently.
+        
+        Each upload runs upload_file in a worker thread, with at most `concurrency`
+        uploads in flight, sharing the authenticated Drive service.
+        
+        Args:
+            paths: Paths of the files to upload
+            folder_id: ID of the folder to upload to (default: target folder ID)
+            concurrency: Maximum number of simultaneous uploads
+            
+        Returns:
+            List[Any]: Per path, in order, the file metadata, None if the upload
+                failed, or the exception it raised
+        """
+        if not self.service:
+            if not await asyncio.to_thread(self.authenticate):
+                logger.error("Failed to authenticate with Google Drive")
+                return [None] * len(paths)
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def upload_one(path: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await asyncio.to_thread(self.upload_file, path, folder_id)
+        
+        return await asyncio.gather(*(upload_one(path) for path in paths), return_exceptions=True)
     
     def create_share_link(self, file_id: str, role: str = 'reader', 
                          type: str = 'anyone') -> Optional[str]:
@@ -401,19 +990,16 @@ class GoogleDriveService:
             # Use target folder as parent if not specified
             if not parent_folder_id:
                 parent_folder_id = self.target_folder_id
-                
-            # Build the query to find the folder
-            query_parts = [f"name = '{folder_name}'"]
-            query_parts.append("mimeType = 'application/vnd.google-apps.folder'")
             
-            # Add parent folder condition if specified
-            if parent_folder_id:
-                query_parts.append(f"'{parent_folder_id}' in parents")
-                
-            # Add not trashed condition
-            query_parts.append("trashed = false")
+            # Reuse a recent lookup for the same folder
+            cache_key = (parent_folder_id, folder_name)
+            folder_id = _get_cached_folder(cache_key)
+            if folder_id:
+                logger.info(f"Found cached folder: {folder_name} (ID: {folder_id})")
+                return folder_id
                 
-            query = " and ".join(query_parts)
+            # Build the query to find the folder
+            query = _folder_query(folder_name, parent_folder_id)
             
             # Search for the folder
             results = self.service.files().list(
@@ -429,6 +1015,7 @@ class GoogleDriveService:
             # If folder exists, return its ID
             if folders:
                 folder_id = folders[0].get('id')
+                _cache_folder(cache_key, folder_id)
                 logger.info(f"Found existing folder: {folder_name} (ID: {folder_id})")
                 return folder_id
             
@@ -436,7 +1023,7 @@ class GoogleDriveService:
             logger.info(f"Folder not found. Creating: {folder_name}")
             folder_metadata = {
                 'name': folder_name,
-                'mimeType': 'application/vnd.google-apps.folder'
+                'mimeType': FOLDER_MIME_TYPE
             }
             
             # Add parent folder if specified
@@ -452,16 +1039,183 @@ class GoogleDriveService:
             ).execute()
             
             folder_id = folder.get('id')
+            if folder_id:
+                _cache_folder(cache_key, folder_id)
             logger.info(f"Created new folder: {folder_name} (ID: {folder_id})")
             return folder_id
             
         except HttpError as e:
+            if e.resp.status == 404:
+                _invalidate_folder(parent_folder_id)
             logger.error(f"HTTP error finding/creating folder: {e}")
             return None
         except Exception as e:
             logger.error(f"Error finding/creating folder: {e}")
             return None
             
+    def create_share_links_bulk(self, file_ids: List[str], role: str = 'reader',
+                                type: str = 'anyone') -> Dict[str, Optional[str]]:
+        """
+        Create shareable links for several files using batched requests.
+        
+        The permission and metadata calls for every file are coalesced into
+        batch requests of up to BATCH_SIZE calls each.
+        
+        Args:
+            file_ids: IDs of the files to share
+            role: Role to grant (reader, writer, commenter)
+            type: Type of sharing (user, group, domain, anyone)
+            
+        Returns:
+            Dict[str, Optional[str]]: Share link URL per file ID (None if error)
+        """
+        share_links: Dict[str, Optional[str]] = {file_id: None for file_id in file_ids}
+        
+        if not self.service:
+            if not self.authenticate():
+                logger.error("Failed to authenticate with Google Drive")
+                return share_links
+        
+        failed = set()
+        
+        def on_response(request_id, response, exception):
+            kind, file_id = request_id.split(':', 1)
+            if exception is not None:
+                logger.error(f"HTTP error creating share link for file {file_id}: {exception}")
+                failed.add(file_id)
+            elif kind == 'get':
+                share_links[file_id] = response.get('webContentLink', response.get('webViewLink'))
+        
+        permission = {
+            'type': type,
+            'role': role,
+            'allowFileDiscovery': False
+        }
+        
+        try:
+            # Each file needs two calls: create permission + get links
+            files_per_batch = BATCH_SIZE // 2
+            for start in range(0, len(file_ids), files_per_batch):
+                batch = self.service.new_batch_http_request(callback=on_response)
+                for file_id in file_ids[start:start + files_per_batch]:
+                    batch.add(self.service.permissions().create(
+                        fileId=file_id,
+                        body=permission,
+                        fields='id',
+                        supportsAllDrives=True
+                    ), request_id=f"permission:{file_id}")
+                    batch.add(self.service.files().get(
+                        fileId=file_id,
+                        fields='webViewLink, webContentLink',
+                        supportsAllDrives=True
+                    ), request_id=f"get:{file_id}")
+                batch.execute()
+        except HttpError as e:
+            logger.error(f"HTTP error creating share links: {e}")
+        except Exception as e:
+            logger.error(f"Error creating share links: {e}")
+        
+        # A link is only usable if its permission was created too
+        for file_id in failed:
+            share_links[file_id] = None
+        
+        logger.info(f"Created {sum(1 for link in share_links.values() if link)} of {len(file_ids)} share links")
+        return share_links
+    
+    def find_or_create_folders_bulk(self, folder_names: List[str],
+                                    parent_folder_id: Optional[str] = None) -> Dict[str, Optional[str]]:
+        """
+        Find or create several folders using batched requests.
+        
+        All lookups are sent as batch requests, then any missing folders are
+        created in a second round of batch requests.
+        
+        Args:
+            folder_names: Names of the folders to find or create
+            parent_folder_id: ID of the parent folder (default: target folder ID)
+            
+        Returns:
+            Dict[str, Optional[str]]: Folder ID per folder name (None if failed)
+        """
+        folder_ids: Dict[str, Optional[str]] = {name: None for name in folder_names}
+        
+        if not self.service:
+            if not self.authenticate():
+                logger.error("Failed to authenticate with Google Drive")
+                return folder_ids
+        
+        # Use target folder as parent if not specified
+        if not parent_folder_id:
+            parent_folder_id = self.target_folder_id
+        
+        # Only look up folders that aren't cached from a recent lookup
+        for name in folder_ids:
+            folder_ids[name] = _get_cached_folder((parent_folder_id, name))
+        names = [name for name, folder_id in folder_ids.items() if not folder_id]
+        missing: List[int] = []
+        
+        def on_found(request_id, response, exception):
+            name = names[int(request_id)]
+            if exception is not None:
+                logger.error(f"HTTP error finding folder {name}: {exception}")
+                return
+            folders = response.get('files', [])
+            if folders:
+                folder_ids[name] = folders[0].get('id')
+                _cache_folder((parent_folder_id, name), folder_ids[name])
+            else:
+                missing.append(int(request_id))
+        
+        def on_created(request_id, response, exception):
+            name = names[int(request_id)]
+            if exception is not None:
+                logger.error(f"HTTP error creating folder {name}: {exception}")
+                return
+            folder_ids[name] = response.get('id')
+            if folder_ids[name]:
+                _cache_folder((parent_folder_id, name), folder_ids[name])
+        
+        try:
+            # Look up all folders
+            for start in range(0, len(names), BATCH_SIZE):
+                batch = self.service.new_batch_http_request(callback=on_found)
+                for index in range(start, min(start + BATCH_SIZE, len(names))):
+                    batch.add(self.service.files().list(
+                        q=_folder_query(names[index], parent_folder_id),
+                        fields="files(id, name)",
+                        supportsAllDrives=True,
+                        supportsTeamDrives=True,
+                        includeItemsFromAllDrives=True
+                    ), request_id=str(index))
+                batch.execute()
+            
+            # Create the folders that don't exist yet
+            for start in range(0, len(missing), BATCH_SIZE):
+                batch = self.service.new_batch_http_request(callback=on_created)
+                for index in missing[start:start + BATCH_SIZE]:
+                    folder_metadata = {
+                        'name': names[index],
+                        'mimeType': FOLDER_MIME_TYPE
+                    }
+                    if parent_folder_id:
+                        folder_metadata['parents'] = [parent_folder_id]
+                    batch.add(self.service.files().create(
+                        body=folder_metadata,
+                        fields='id, name',
+                        supportsAllDrives=True,
+                        supportsTeamDrives=True
+                    ), request_id=str(index))
+                batch.execute()
+            
+            logger.info(f"Found {len(names) - len(missing)} and created {len(missing)} folders")
+            
+        except HttpError as e:
+            logger.error(f"HTTP error finding/creating folders: {e}")
+        except Exception as e:
+            logger.error(f"Error finding/creating folders: {e}")
+        
+        return folder_ids
+            
     def get_upload_status(self, file_id: str) -> Optional[Dict[str, Any]]:
         """
         Get the status of an uploaded file.
@@ -493,42 +1247,94 @@ class GoogleDriveService:
             logger.error(f"Error getting file status: {e}")
             return None
     
-    def list_files_in_folder(self, folder_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    def iter_files_in_folder(self, folder_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
         """
-        List files in a Google Drive folder.
+        Iterate over all files in a Google Drive folder, across every page.
+        
+        Pages are fetched on a background thread that stays up to two pages
+        ahead of the caller, so network latency overlaps with consuming the
+        current page.
         
         Args:
             folder_id: ID of the folder (default: target folder)
             
-        Returns:
-            List[Dict[str, Any]]: List of file metadata
+        Yields:
+            Dict[str, Any]: File metadata
+            
+        Raises:
+            HttpError: If a page request fails
         """
         if not self.service:
             if not self.authenticate():
                 logger.error("Failed to authenticate with Google Drive")
-                return []
+                return
+        
+        # Use target folder if folder_id not provided
+        if not folder_id:
+            folder_id = self.target_folder_id
+        
+        if not folder_id:
+            logger.error("No folder ID provided or configured")
+            return
         
+        # Query for files in the folder
+        query = f"'{folder_id}' in parents and trashed = false"
+        
+        files_resource = self.service.files()
+        request = files_resource.list(
+            q=query,
+            pageSize=1000,  # API maximum
+            fields="nextPageToken, files(id, name, mimeType, webViewLink, size, createdTime, modifiedTime)"
+        )
+        
+        # Pages (or the error that stopped fetching) handed from the worker; None marks the end
+        pages: queue.Queue = queue.Queue(maxsize=2)
+        stop = threading.Event()
+        
+        def fetch_pages():
+            nonlocal request
+            try:
+                while request is not None and not stop.is_set():
+                    response = request.execute()
+                    pages.put(response)
+                    request = files_resource.list_next(request, response)
+            except Exception as e:
+                pages.put(e)
+                return
+            pages.put(None)
+        
+        worker = threading.Thread(target=fetch_pages, name='gdrive-list-prefetch', daemon=True)
+        worker.start()
         try:
-            # Use target folder if folder_id not provided
-            if not folder_id:
-                folder_id = self.target_folder_id
-            
-            if not folder_id:
-                logger.error("No folder ID provided or configured")
-                return []
-            
-            # Query for files in the folder
-            query = f"'{folder_id}' in parents and trashed = false"
-            
-            # List the files
-            results = self.service.files().list(
-                q=query,
-                pageSize=100,
-                fields="nextPageToken, files(id, name, mimeType, webViewLink, size, createdTime, modifiedTime)"
-            ).execute()
+            while True:
+                page = pages.get()
+                if page is None:
+                    return
+                if isinstance(page, Exception):
+                    raise page
+                yield from page.get('files', [])
+        finally:
+            # Stop the worker and unblock it if it is waiting on a full queue
+            stop.set()
+            while worker.is_alive():
+                try:
+                    pages.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+    
+    def list_files_in_folder(self, folder_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List files in a Google Drive folder.
+        
+        Args:
+            folder_id: ID of the folder (default: target folder)
             
-            files = results.get('files', [])
-            logger.info(f"Found {len(files)} files in folder {folder_id}")
+        Returns:
+            List[Dict[str, Any]]: List of file metadata
+        """
+        try:
+            files = list(self.iter_files_in_folder(folder_id))
+            logger.info(f"Found {len(files)} files in folder {folder_id or self.target_folder_id}")
             return files
             
         except HttpError as e:
@@ -5,46 +5,95 @@ This module provides functionality to store and retrieve job information
 from Google Firestore, enabling job persistence across Cloud Run instances.
 """
 
-import json
 from datetime import datetime
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Union, Callable
 from google.cloud import firestore
+import atexit
+import functools
 import logging
+import threading
 
 from app.models.schemas import ProcessingStatusEnum
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Initialize Firestore client
-db = firestore.Client()
-jobs_collection = db.collection('frame_io_jobs')
+
+@functools.lru_cache(maxsize=1)
+def _db() -> firestore.Client:
+    """
+    Create the Firestore client on first use, keeping module import cheap.
+    
+    The client is shared by the whole process, so every job read and write reuses
+    its single gRPC (HTTP/2) channel, which Firestore keeps alive between calls.
+    """
+    return firestore.Client()
+
+
+@functools.lru_cache(maxsize=1)
+def _jobs() -> firestore.CollectionReference:
+    """Get the Firestore collection that stores jobs."""
+    return _db().collection('frame_io_jobs')
+
+
+# How long status updates are buffered before being written (seconds)
+FLUSH_INTERVAL = 0.5
+# Longest wait between retries while flushes keep failing (seconds)
+MAX_RETRY_INTERVAL = 60.0
+# Firestore allows at most 500 writes per batch
+MAX_BATCH_WRITES = 500
+
+# Buffered status updates per job, merged until the next flush
+_pending: Dict[str, Dict[str, Any]] = {}
+_pending_lock = threading.Lock()
+_flush_timer: Optional[threading.Timer] = None
+# Delay before the next flush; doubles after each failed commit
+_flush_delay = FLUSH_INTERVAL
+# Held for a whole flush or save_job write, so batches are committed in the order they were taken
+_commit_lock = threading.Lock()
+
+# States after which no further updates are expected
+_TERMINAL_STATES = frozenset((ProcessingStatusEnum.COMPLETED.value, ProcessingStatusEnum.FAILED.value))
 
 
 def save_job(job_id: str, job_data: Dict[str, Any]) -> None:
     """
     Save job data to Firestore.
     
+    The document replaces any status updates still buffered for the job, so an
+    older buffered update can't be merged over it by a later flush.
+    
     Args:
         job_id: Unique ID for the job
         job_data: Job data to store
     """
-    try:
-        # Convert datetime objects to ISO format strings
-        serialized_data = _serialize_job_data(job_data)
+    # Don't overlap a flush, which may be committing updates for this job
+    with _commit_lock:
+        with _pending_lock:
+            superseded = _pending.pop(job_id, None)
         
-        # Store job data
-        jobs_collection.document(job_id).set(serialized_data)
-        logger.info(f"Job {job_id} saved to Firestore")
-    except Exception as e:
-        logger.error(f"Error saving job {job_id} to Firestore: {e}")
-        # Continue without failing - fallback to in-memory storage
+        try:
+            # Store job data as-is; Firestore encodes datetimes, dicts and lists natively
+            try:
+                _jobs().document(job_id).set(job_data)
+            except TypeError:
+                # Custom objects can't be encoded by Firestore - serialize them first
+                _jobs().document(job_id).set(_serialize_job_data(job_data))
+            logger.info(f"Job {job_id} saved to Firestore")
+        except Exception as e:
+            logger.error(f"Error saving job {job_id} to Firestore: {e}")
+            # Continue without failing - fallback to in-memory storage
+            if superseded is not None:
+                _requeue([(job_id, superseded)])
 
 
 def get_job(job_id: str) -> Optional[Dict[str, Any]]:
     """
     Get job data from Firestore.
     
+    Status updates that are still buffered are applied on top of the stored
+    document, so the result reflects the latest update_job_status() call.
+    
     Args:
         job_id: Unique ID for the job
         
@@ -52,11 +101,24 @@ def get_job(job_id: str) -> Optional[Dict[str, Any]]:
         Job data dictionary or None if job not found
     """
     try:
-        job_ref = jobs_collection.document(job_id)
+        job_ref = _jobs().document(job_id)
         job = job_ref.get()
         
+        with _pending_lock:
+            pending = _pending.get(job_id)
+            if pending is not None:
+                # Server-side timestamps only get a value once written; keep the stored one
+                pending = {key: value for key, value in pending.items()
+                           if value is not firestore.SERVER_TIMESTAMP}
+        
         if job.exists:
-            return job.to_dict()
+            job_data = job.to_dict()
+            if pending:
+                job_data.update(pending)
+            return job_data
+        
+        if pending:
+            return pending
         
         logger.warning(f"Job {job_id} not found in Firestore")
         return None
@@ -77,6 +139,9 @@ def update_job_status(
     """
     Update job status in Firestore.
     
+    Updates are merged per job and written in a single batch every FLUSH_INTERVAL
+    seconds; terminal states are flushed immediately.
+    
     Args:
         job_id: Unique ID for the job
         state: Current state of the job
@@ -90,10 +155,10 @@ def update_job_status(
         if isinstance(state, ProcessingStatusEnum):
             state = state.value
         
-        # Prepare update data
+        # Prepare update data; Firestore fills in the timestamp server-side
         update_data = {
             'state': state,
-            'last_updated': datetime.now().isoformat()
+            'last_updated': firestore.SERVER_TIMESTAMP
         }
         
         if progress is not None:
@@ -106,29 +171,140 @@ def update_job_status(
             update_data['error'] = error
         
         # Add any additional fields
-        for k, v in kwargs.items():
-            # Serialize any complex objects
-            if isinstance(v, datetime):
-                update_data[k] = v.isoformat()
-            elif isinstance(v, dict):
-                update_data[k] = _serialize_job_data(v)
-            else:
-                update_data[k] = v
+        update_data.update(kwargs)
+        
+        # Merge into the pending update and make sure a flush is scheduled
+        with _pending_lock:
+            _pending.setdefault(job_id, {}).update(update_data)
+            _schedule_flush()
+        logger.info(f"Job {job_id} status queued for Firestore: state={state}, progress={progress}")
         
-        # Update Firestore document
-        jobs_collection.document(job_id).update(update_data)
-        logger.info(f"Job {job_id} status updated in Firestore: state={state}, progress={progress}")
+        if state in _TERMINAL_STATES:
+            flush_now()
         
     except Exception as e:
         logger.error(f"Error updating job {job_id} in Firestore: {e}")
         # Continue without failing - fallback to in-memory storage
 
 
+def _schedule_flush() -> None:
+    """Start the flush timer if it isn't running. Must be called with _pending_lock held."""
+    global _flush_timer
+    if _flush_timer is None:
+        _flush_timer = threading.Timer(_flush_delay, flush_now)
+        _flush_timer.daemon = True
+        _flush_timer.start()
+
+
+def flush_now() -> None:
+    """
+    Write all buffered status updates to Firestore in batches.
+    
+    Called by the flush timer, for terminal job states and at interpreter exit.
+    Flushes never overlap, so an older update can't land after a newer one. Updates
+    from a batch that fails to commit are queued again, and the next flush is
+    delayed twice as long each time, up to MAX_RETRY_INTERVAL.
+    """
+    global _flush_timer
+    with _commit_lock:
+        with _pending_lock:
+            if _flush_timer is not None:
+                _flush_timer.cancel()
+                _flush_timer = None
+            pending = list(_pending.items())
+            _pending.clear()
+        
+        if pending:
+            _commit_pending(pending)
+
+
+def _commit_pending(pending: list) -> None:
+    """
+    Commit buffered status updates, re-queueing any that could not be written.
+    
+    Args:
+        pending: (job_id, update_data) pairs taken from _pending
+    """
+    global _flush_delay
+    committed = 0
+    try:
+        for start in range(0, len(pending), MAX_BATCH_WRITES):
+            batch = _db().batch()
+            for job_id, update_data in pending[start:start + MAX_BATCH_WRITES]:
+                job_ref = _jobs().document(job_id)
+                try:
+                    batch.set(job_ref, update_data, merge=True)
+                except TypeError:
+                    # Custom objects can't be encoded by Firestore - serialize them first
+                    batch.set(job_ref, _serialize_job_data(update_data), merge=True)
+            batch.commit()
+            committed = start + MAX_BATCH_WRITES
+        logger.info(f"Flushed status updates for {len(pending)} jobs to Firestore")
+        _flush_delay = FLUSH_INTERVAL
+    except Exception as e:
+        logger.error(f"Error flushing job status updates to Firestore: {e}")
+        # Back off before retrying, so a lasting outage isn't retried every interval
+        _flush_delay = min(_flush_delay * 2, MAX_RETRY_INTERVAL)
+        _requeue(pending[committed:])
+
+
+def _requeue(updates: list) -> None:
+    """
+    Put status updates that could not be written back for the next flush.
+    
+    Fields a newer update has set since then take precedence.
+    
+    Args:
+        updates: (job_id, update_data) pairs to queue again
+    """
+    with _pending_lock:
+        for job_id, update_data in updates:
+            newer = _pending.get(job_id)
+            if newer is not None:
+                update_data = {**update_data, **newer}
+            _pending[job_id] = update_data
+        _schedule_flush()
+
+
+# Don't lose buffered updates on shutdown
+atexit.register(flush_now)
+
+
+# Types that never need conversion for Firestore storage
+_PRIMITIVE_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def _serialize_sequence(value: Union[list, tuple]) -> list:
+    """
+    Serialize a list or tuple, converting datetime items to ISO format strings.
+    
+    Lists without datetime items are returned unchanged.
+    """
+    if type(value) is list and not any(isinstance(item, datetime) for item in value):
+        return value
+    return [item.isoformat() if isinstance(item, datetime) else item for item in value]
+
+
+# Conversions for leaf values, dispatched on exact type
+_TYPE_HANDLERS: Dict[type, Callable[[Any], Any]] = {
+    datetime: datetime.isoformat,
+    list: _serialize_sequence,
+    tuple: _serialize_sequence,
+}
+
+
+def _is_custom_object(value: Any) -> bool:
+    """Check whether a value is a custom object to be stored as its attribute dict."""
+    return hasattr(value, '__dict__') and not isinstance(value, (str, int, float, bool, list, dict))
+
+
 def _serialize_job_data(data: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Serialize job data for Firestore storage.
+    Serialize job data that Firestore cannot encode directly.
     
-    Converts datetime objects to ISO format strings and handles other non-serializable types.
+    Converts custom objects to dictionaries and datetime objects to ISO format strings.
+    Nested dictionaries are walked iteratively, and a dictionary is only copied when one
+    of its values actually needs converting; otherwise the original is returned as-is.
     
     Args:
         data: Job data to serialize
@@ -136,25 +312,58 @@ def _serialize_job_data(data: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Serialized job data
     """
-    serialized = {}
-    
-    for key, value in data.items():
-        if isinstance(value, datetime):
-            serialized[key] = value.isoformat()
-        elif hasattr(value, '__dict__') and not isinstance(value, (str, int, float, bool, list, dict)):
-            # Convert custom objects to dictionaries
-            serialized[key] = _serialize_job_data(value.__dict__)
-        elif isinstance(value, dict):
-            # Recursively serialize nested dictionaries
-            serialized[key] = _serialize_job_data(value)
-        elif isinstance(value, (list, tuple)):
-            # Handle lists and tuples
-            serialized[key] = [
-                item.isoformat() if isinstance(item, datetime) else item
-                for item in value
-            ]
+    # Each frame is [source dict, items iterator, copied dict or None, key in parent]
+    stack = [[data, iter(data.items()), None, None]]
+    result = data
+    
+    while stack:
+        frame = stack[-1]
+        source, items = frame[0], frame[1]
+        
+        for key, value in items:
+            value_type = type(value)
+            if value_type in _PRIMITIVE_TYPES:
+                continue
+            
+            if value_type is dict:
+                # Descend into nested dictionaries
+                stack.append([value, iter(value.items()), None, key])
+                break
+            
+            handler = _TYPE_HANDLERS.get(value_type)
+            if handler is not None:
+                converted = handler(value)
+            elif isinstance(value, datetime):
+                converted = value.isoformat()
+            elif _is_custom_object(value):
+                # Convert custom objects to dictionaries
+                stack.append([value.__dict__, iter(value.__dict__.items()), dict(value.__dict__), key])
+                break
+            elif isinstance(value, dict):
+                stack.append([value, iter(value.items()), None, key])
+                break
+            elif isinstance(value, (list, tuple)):
+                converted = _serialize_sequence(value)
+            else:
+                # For basic types
+                continue
+            
+            if converted is not value:
+                if frame[2] is None:
+                    frame[2] = dict(source)
+                frame[2][key] = converted
         else:
-            # For basic types
-            serialized[key] = value
+            # All items of this dictionary have been processed
+            stack.pop()
+            done = frame[2] if frame[2] is not None else source
+            if not stack:
+                result = done
+                continue
+            
+            parent = stack[-1]
+            if done is not parent[0][frame[3]]:
+                if parent[2] is None:
+                    parent[2] = dict(parent[0])
+                parent[2][frame[3]] = done
     
-    return serialized
+    return result
@@ -11,24 +11,54 @@ This service handles the integrated workflow to:
 
 import os
 import time
-import shutil
 import asyncio
+import random
+import re
 import json
-import gc  # For explicit garbage collection
 import logging
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple, Callable
 from datetime import datetime
 
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
 from app.services.browser_service import BrowserService
 from app.services.gdrive_service import GoogleDriveService
-from app.utils.file_handler import ensure_temp_dirs, get_file_info
+from app.utils.file_handler import ensure_temp_dirs, get_file_info, stage_file
 from app.config import settings
 from app.models.schemas import ProcessingStatusEnum
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Download retry backoff: sleep a random time up to min(cap, base * 2**attempt) seconds
+DOWNLOAD_BACKOFF_BASE = 0.5
+DOWNLOAD_BACKOFF_CAP = 30.0
+
+# Last path segment of a Frame.io URL, ignoring a trailing slash, query string or fragment
+ASSET_ID_RE = re.compile(r"/([^/?#]+)/?(?:[?#].*)?$")
+
+# Errors worth retrying a download for: timeouts and network failures
+RETRYABLE_DOWNLOAD_ERRORS = (PlaywrightTimeoutError, asyncio.TimeoutError, ConnectionError, OSError)
+
+
+async def _discard_task(task: Optional[asyncio.Task]) -> None:
+    """
+    Cancel a background task that is no longer needed and wait for it to finish.
+    
+    Args:
+        task: The task to discard (None and finished tasks are fine)
+    """
+    if task is None:
+        return
+    
+    task.cancel()
+    # wait() never raises the task's own error, only the caller's cancellation
+    await asyncio.wait({task})
+    if not task.cancelled():
+        # Retrieve any error so asyncio doesn't log it as never retrieved
+        task.exception()
+
 
 class TransferService:
     """Service to handle the transfer of files from Frame.io to Google Drive."""
@@ -71,6 +101,7 @@ class TransferService:
         
         download_path = None
         file_path = None
+        auth_task = None
         
         # Record start time
         start_time = time.time()
@@ -80,23 +111,24 @@ class TransferService:
             await self._update_status(status_callback, processing_id, ProcessingStatusEnum.EXTRACTING, 5, 
                                      "Extracting asset information from Frame.io")
             
-            # Extract asset ID from URL for better naming
-            try:
-                asset_id = frame_io_url.split("/")[-1]
-                if not asset_id:
-                    logger.warning("Could not extract asset ID from Frame.io URL")
-                    asset_id = "unknown"
-                    
-                results["asset_metadata"]["frameio_id"] = asset_id
+            # Extract asset ID (last path segment) from URL for better naming
+            match = ASSET_ID_RE.search(frame_io_url)
+            if match:
+                asset_id = match.group(1)
                 asset_name = f"Frame.io {asset_id}"
-                logger.info(f"✅ Successfully extracted asset ID: {asset_id}")
-            except Exception as e:
-                logger.warning(f"Error extracting asset ID: {e}")
+                logger.info("✅ Successfully extracted asset ID: %s", asset_id)
+            else:
+                logger.warning("Could not extract asset ID from Frame.io URL")
                 asset_id = "unknown"
                 asset_name = "Frame.io Asset"
             
+            results["asset_metadata"]["frameio_id"] = asset_id
             results["asset_metadata"]["name"] = asset_name
             
+            # Authenticate with Google Drive in the background while downloading; the
+            # folder is only created once there is a file to put in it
+            auth_task = asyncio.create_task(asyncio.to_thread(self._authenticate_drive))
+            
             # Step 2: Download the asset
             await self._update_status(status_callback, processing_id, ProcessingStatusEnum.DOWNLOADING, 15, 
                                      f"Downloading asset: {asset_name}")
@@ -105,47 +137,22 @@ class TransferService:
             download_path = None
             file_name = None
             
-            # Get download directory
-            download_dir = settings.temp_download_dir
-            os.makedirs(download_dir, exist_ok=True)
-            
+            # Temp directories were created by ensure_temp_dirs() in __init__
             # Implement download logic exactly as in test_integrated_workflow
             try:
                 # Initialize and launch the browser
                 await self.browser_service.launch_browser(headless=True)
                 
                 # Download asset using browser automation with retry logic
-                max_download_attempts = 3
-                for attempt in range(max_download_attempts):
-                    try:
-                        await self._update_status(status_callback, processing_id, ProcessingStatusEnum.DOWNLOADING, 
-                                               15 + (attempt * 5), 
-                                               f"Download attempt {attempt+1}/{max_download_attempts}")
-                        
-                        logger.info(f"Download attempt {attempt+1}/{max_download_attempts}...")
-                        download_path = await self.browser_service.download_frame_io_asset(frame_io_url)
-                        
-                        if download_path and os.path.exists(download_path):
-                            logger.info(f"✅ Download successful on attempt {attempt+1}")
-                            break
-                        else:
-                            logger.warning(f"Download attempt {attempt+1} failed, retrying...")
-                            await asyncio.sleep(2)  # Wait before retry
-                    except Exception as e:
-                        logger.warning(f"Error during download attempt {attempt+1}: {str(e)}")
-                        if attempt < max_download_attempts - 1:
-                            logger.info("Retrying download...")
-                            await asyncio.sleep(2)  # Wait before retry
-                        else:
-                            logger.error(f"❌ Failed to download after {max_download_attempts} attempts: {str(e)}")
+                download_path = await self._download_one(frame_io_url, status_callback, processing_id)
                 
-                if not download_path or not os.path.exists(download_path):
+                if not download_path:
                     logger.error("❌ Failed to download asset from Frame.io")
                     await self._update_status(status_callback, processing_id, ProcessingStatusEnum.FAILED, 0, 
                                              "Failed to download asset", "Download failed or file not found")
                     return results
             except Exception as e:
-                logger.error(f"❌ Error downloading asset: {e}")
+                logger.error("❌ Error downloading asset: %s", e)
                 await self._update_status(status_callback, processing_id, ProcessingStatusEnum.FAILED, 0, 
                                          "Failed to download asset", str(e))
                 return results
@@ -153,14 +160,12 @@ class TransferService:
                 # Always close the browser after download attempts
                 try:
                     await self.browser_service.close_browser()
-                    # Give the system a moment to clean up resources
-                    await asyncio.sleep(0.5)
                 except Exception as e:
-                    logger.warning(f"Error closing browser: {e}")
+                    logger.warning("Error closing browser: %s", e)
             
             # Get file name and info
             file_name = os.path.basename(download_path)
-            file_info = get_file_info(download_path)
+            file_info = await asyncio.to_thread(get_file_info, download_path, compute_md5=False)
             results["asset_metadata"].update(file_info)
             results["asset_metadata"]["name"] = file_name
             
@@ -170,35 +175,32 @@ class TransferService:
             
             download_time = time.time() - download_start_time
             results["timing"]["download_time"] = download_time
-            logger.info(f"✅ Asset Download: {download_path} ({size_mb:.2f} MB)")
+            logger.info("✅ Asset Download: %s (%.2f MB)", download_path, size_mb)
             
             # Step 3: Process the file (move to processing directory)
             await self._update_status(status_callback, processing_id, ProcessingStatusEnum.PROCESSING, 30, 
-                                      f"Processing file: {os.path.basename(download_path)}")
+                                      f"Processing file: {file_name}")
             
             processing_start_time = time.time()
             
-            # Process the file (copy to processing directory)
-            processing_dir = settings.temp_processing_dir
-            os.makedirs(processing_dir, exist_ok=True)
+            # Process the file (stage it in the processing directory)
+            file_path = os.path.join(settings.temp_processing_dir, file_name)
             
-            # Get filename without path
-            file_name = os.path.basename(download_path)
-            file_path = os.path.join(processing_dir, file_name)
-            
-            # Copy file to processing directory
-            shutil.copy2(download_path, file_path)
+            # Stage file in processing directory (hard link or clone, copy as a last resort)
+            staged_with = await asyncio.to_thread(stage_file, download_path, file_path)
+            logger.info("Staged file for processing via %s", staged_with)
             
             processing_time = time.time() - processing_start_time
             results["timing"]["processing_time"] = processing_time
-            logger.info(f"✅ File Processing: {file_path}")
+            logger.info("✅ File Processing: %s", file_path)
             
             # Step 4: Authenticate with Google Drive
             await self._update_status(status_callback, processing_id, ProcessingStatusEnum.AUTHENTICATING, 40, 
                                      "Authenticating with Google Drive")
             
-            # Authenticate with Google Drive
-            if not self.gdrive_service.authenticate():
+            # Wait for the authentication started alongside the download
+            authenticated = await auth_task
+            if not authenticated:
                 logger.error("❌ Failed to authenticate with Google Drive")
                 await self._update_status(status_callback, processing_id, ProcessingStatusEnum.FAILED, 0, 
                                          "Failed to authenticate with Google Drive", 
@@ -211,18 +213,16 @@ class TransferService:
             await self._update_status(status_callback, processing_id, ProcessingStatusEnum.CREATING_FOLDER, 50, 
                                      f"Creating or finding folder: {folder_name}")
             
-            # Find or create the folder
-            folder_id = self.gdrive_service.find_or_create_folder(folder_name)
-            
+            folder_id = await asyncio.to_thread(self.gdrive_service.find_or_create_folder, folder_name)
             if not folder_id:
-                logger.error(f"❌ Failed to create/find folder: {folder_name}")
+                logger.error("❌ Failed to create/find folder: %s", folder_name)
                 await self._update_status(status_callback, processing_id, ProcessingStatusEnum.FAILED, 0, 
                                          f"Failed to create/find folder: {folder_name}", 
                                          "Folder creation/lookup failed")
                 return results
             
             results["asset_metadata"]["folder_id"] = folder_id
-            logger.info(f"✅ Google Drive Folder Creation: {folder_name} (ID: {folder_id})")
+            logger.info("✅ Google Drive Folder Creation: %s (ID: %s)", folder_name, folder_id)
             
             # Step 6: Upload the file to Google Drive
             await self._update_status(status_callback, processing_id, ProcessingStatusEnum.UPLOADING, 60, 
@@ -230,8 +230,9 @@ class TransferService:
             
             upload_start_time = time.time()
             
-            # Upload the file
-            file = self.gdrive_service.upload_file(
+            # Upload the file in a worker thread; the Drive client is synchronous
+            file = await asyncio.to_thread(
+                self.gdrive_service.upload_file,
                 file_path=file_path,
                 folder_id=folder_id,
                 name=file_name
@@ -248,14 +249,14 @@ class TransferService:
             results["asset_metadata"]["file_id"] = file_id
             upload_time = time.time() - upload_start_time
             results["timing"]["upload_time"] = upload_time
-            logger.info(f"✅ Google Drive File Upload: {file_id}")
+            logger.info("✅ Google Drive File Upload: %s", file_id)
             
             # Step 7: Generate shareable link
             await self._update_status(status_callback, processing_id, ProcessingStatusEnum.GENERATING_LINK, 80, 
                                      "Generating shareable link")
             
             # Create share link
-            share_link = self.gdrive_service.create_share_link(file_id)
+            share_link = await asyncio.to_thread(self.gdrive_service.create_share_link, file_id)
             
             if not share_link:
                 logger.error("❌ Failed to generate shareable link")
@@ -265,32 +266,23 @@ class TransferService:
                 return results
             
             results["asset_metadata"]["share_link"] = share_link
-            logger.info(f"✅ Share Link Generation: {share_link}")
+            logger.info("✅ Share Link Generation: %s", share_link)
             
             # Step 8: Cleanup
             await self._update_status(status_callback, processing_id, ProcessingStatusEnum.CLEANUP, 90, 
                                      "Cleaning up temporary files")
             
-            # Clean up temporary files
+            # Clean up temporary files off the event loop
             try:
-                if download_path and os.path.exists(download_path):
-                    os.remove(download_path)
-                    logger.info(f"✅ Successfully removed file: {download_path}")
-                
-                if file_path and os.path.exists(file_path):
-                    os.remove(file_path)
-                    logger.info(f"✅ Successfully removed file: {file_path}")
+                await self._cleanup_one(download_path, file_path)
                 
                 logger.info("✅ Successfully cleaned up all temporary files")
             except Exception as e:
-                logger.warning(f"Warning during cleanup: {e}")
+                logger.warning("Warning during cleanup: %s", e)
             
             # Record end time and set success
             results["success"] = True
             
-            # Close browser
-            await self.browser_service.close_browser()
-            
             # Upload successful - Create file_info for response
             file_info = {
                 "file_id": file.get('id'),
@@ -322,9 +314,10 @@ class TransferService:
             
         except Exception as e:
             # Log the error and update status
-            logger.error(f"❌ Error in Frame.io to Google Drive workflow: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.error("❌ Error in Frame.io to Google Drive workflow: %s", e)
+            if logger.isEnabledFor(logging.ERROR):
+                import traceback
+                logger.error(traceback.format_exc())
             
             # Update status to failed
             await self._update_status(
@@ -335,17 +328,221 @@ class TransferService:
                 "Transfer failed", 
                 str(e)
             )
-            
         finally:
-            # Browser should already be closed after download, but ensure garbage collection
-            # Force garbage collection to clean up resources
-            gc.collect()
-            # Wait a moment for cleanup
-            await asyncio.sleep(0.5)
+            # Don't leave the background authentication running after a failure
+            await _discard_task(auth_task)
         
         # Return results
         return results
     
+    async def process_frame_io_urls(
+        self,
+        frame_io_urls: List[str],
+        folder_name: str,
+        max_concurrency: int = 4
+    ) -> List[Dict[str, Any]]:
+        """
+        Transfer several Frame.io assets into one Google Drive folder.
+        
+        The browser is launched and logged in once for the whole batch. Downloads
+        run one after another on its page, while up to max_concurrency uploads of
+        already downloaded assets run alongside them.
+        
+        Args:
+            frame_io_urls: Frame.io URLs to process
+            folder_name: Name of the Google Drive folder to upload into
+            max_concurrency: Maximum number of simultaneous uploads
+            
+        Returns:
+            List[Dict[str, Any]]: Result per URL, in input order, with success,
+                frame_io_url, file_id, share_link and error
+        """
+        results = [{"success": False, "frame_io_url": url, "file_id": None,
+                    "share_link": None, "error": None} for url in frame_io_urls]
+        if not frame_io_urls:
+            return results
+        
+        # Authenticate while the first asset downloads; the folder is only created
+        # once a download has succeeded, so failed batches leave nothing behind
+        auth_task = asyncio.create_task(asyncio.to_thread(self._authenticate_drive))
+        folder_task: Optional[asyncio.Task] = None
+        
+        async def resolve_folder() -> Tuple[bool, Optional[str]]:
+            if not await auth_task:
+                return False, None
+            return True, await asyncio.to_thread(self.gdrive_service.find_or_create_folder, folder_name)
+        
+        # Downloaded files waiting for upload; bounded so finished downloads don't pile up on disk
+        upload_queue: asyncio.Queue = asyncio.Queue(maxsize=max_concurrency)
+        
+        async def upload_worker() -> None:
+            nonlocal folder_task
+            while True:
+                item = await upload_queue.get()
+                if item is None:
+                    return
+                
+                index, download_path = item
+                try:
+                    # The first upload starts the folder lookup, the others share it
+                    if folder_task is None:
+                        folder_task = asyncio.create_task(resolve_folder())
+                    authenticated, folder_id = await folder_task
+                    if not folder_id:
+                        results[index]["error"] = ("Authentication failed - check credentials" if not authenticated
+                                                   else f"Failed to create/find folder: {folder_name}")
+                        continue
+                    
+                    upload = await self._upload_one(download_path, folder_id)
+                    results[index].update(upload)
+                except Exception as e:
+                    logger.error("❌ Error uploading %s: %s", download_path, e)
+                    results[index]["error"] = str(e)
+                finally:
+                    # A cleanup error must not stop the worker, or downloads
+                    # waiting for space in the queue would block forever
+                    try:
+                        await self._cleanup_one(download_path)
+                    except Exception as e:
+                        logger.warning("Error cleaning up %s: %s", download_path, e)
+        
+        workers = [asyncio.create_task(upload_worker()) for _ in range(max_concurrency)]
+        
+        try:
+            await self.browser_service.launch_browser(headless=True)
+            
+            for index, frame_io_url in enumerate(frame_io_urls):
+                download_path = await self._download_one(frame_io_url)
+                if download_path:
+                    await upload_queue.put((index, download_path))
+                else:
+                    results[index]["error"] = "Download failed or file not found"
+        except Exception as e:
+            logger.error("❌ Error downloading assets: %s", e)
+            for result in results:
+                if not result["success"] and not result["error"]:
+                    result["error"] = str(e)
+        finally:
+            await self.browser_service.close_browser()
+            
+            # Let the workers drain the queue, then stop them
+            for _ in workers:
+                await upload_queue.put(None)
+            await asyncio.gather(*workers)
+            
+            # Nothing was uploaded if every download failed
+            await _discard_task(auth_task)
+        
+        succeeded = sum(1 for result in results if result["success"])
+        logger.info("✅ Transferred %s/%s assets to folder: %s", succeeded, len(results), folder_name)
+        return results
+    
+    async def _download_one(
+        self,
+        frame_io_url: str,
+        status_callback: Optional[Callable] = None,
+        processing_id: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Download a Frame.io asset with the launched browser, retrying on failure.
+        
+        Args:
+            frame_io_url: Frame.io URL to download
+            status_callback: Callback function to update the processing status (optional)
+            processing_id: ID of the processing job, for status updates
+            
+        Returns:
+            Optional[str]: Path to the downloaded file, None if all attempts failed
+        """
+        download_path = None
+        
+        max_download_attempts = 3
+        for attempt in range(max_download_attempts):
+            try:
+                await self._update_status(status_callback, processing_id, ProcessingStatusEnum.DOWNLOADING, 
+                                         15 + (attempt * 5), 
+                                         f"Download attempt {attempt+1}/{max_download_attempts}")
+                
+                logger.info("Download attempt %s/%s...", attempt+1, max_download_attempts)
+                download_path = await self.browser_service.download_frame_io_asset(frame_io_url)
+                
+                if download_path and os.path.exists(download_path):
+                    logger.info("✅ Download successful on attempt %s", attempt+1)
+                    break
+                logger.warning("Download attempt %s failed", attempt+1)
+            except RETRYABLE_DOWNLOAD_ERRORS as e:
+                logger.warning("Error during download attempt %s: %s", attempt+1, e)
+            except Exception as e:
+                # Anything other than a network error or timeout won't succeed on retry
+                logger.error("❌ Download failed with a non-retryable error: %s", e)
+                return None
+            
+            if attempt < max_download_attempts - 1:
+                # Exponential backoff with full jitter
+                delay = random.uniform(0, min(DOWNLOAD_BACKOFF_CAP, DOWNLOAD_BACKOFF_BASE * 2 ** attempt))
+                logger.info("Retrying download in %.1fs...", delay)
+                await asyncio.sleep(delay)
+            else:
+                logger.error("❌ Failed to download after %s attempts", max_download_attempts)
+        
+        if download_path and os.path.exists(download_path):
+            return download_path
+        return None
+    
+    async def _upload_one(self, file_path: str, folder_id: str) -> Dict[str, Any]:
+        """
+        Upload a file to Google Drive and create a shareable link for it.
+        
+        Args:
+            file_path: Path to the file to upload
+            folder_id: ID of the Google Drive folder to upload to
+            
+        Returns:
+            Dict[str, Any]: success, file_id, share_link and error
+        """
+        file = await asyncio.to_thread(self.gdrive_service.upload_file, file_path, folder_id)
+        if not file or not file.get('id'):
+            return {"success": False, "error": "Upload failed"}
+        
+        file_id = file.get('id')
+        share_link = await asyncio.to_thread(self.gdrive_service.create_share_link, file_id)
+        if not share_link:
+            return {"success": False, "file_id": file_id, "error": "Share link generation failed"}
+        
+        logger.info("✅ Google Drive File Upload: %s", file_id)
+        return {"success": True, "file_id": file_id, "share_link": share_link, "error": None}
+    
+    async def _cleanup_one(self, *paths: Optional[str]) -> None:
+        """
+        Remove a transfer's temporary files off the event loop.
+        
+        Args:
+            *paths: Paths of the temporary files (None entries are skipped)
+        """
+        for temp_path in paths:
+            if not temp_path:
+                continue
+            try:
+                await asyncio.to_thread(os.remove, temp_path)
+            except FileNotFoundError:
+                continue
+            logger.info("✅ Successfully removed file: %s", temp_path)
+    
+    def _authenticate_drive(self) -> bool:
+        """
+        Authenticate with Google Drive.
+        
+        Runs in a worker thread while the asset is downloading.
+        
+        Returns:
+            bool: True if authentication succeeded, False otherwise
+        """
+        try:
+            return bool(self.gdrive_service.authenticate())
+        except Exception as e:
+            logger.error("Error authenticating with Google Drive: %s", e)
+            return False
+    
     async def _update_status(
         self, 
         callback: Callable, 
@@ -14,20 +14,42 @@ import logging
 import hashlib
 import mimetypes
 import datetime
+from types import MappingProxyType
 from typing import List, Dict, Optional, Tuple, Set
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:  # Optional; calculate_hash defaults to BLAKE2b without it
+    _blake3 = None
+
 from app.config import settings
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Initialize mimetypes
-mimetypes.init()
+# ioctl request for FICLONE: copy-on-write clone of a whole file (Btrfs, XFS)
+FICLONE = 0x40049409
+
+# Read buffer size for hashing files
+HASH_BUFFER_SIZE = 1024 * 1024
+
+# Algorithm calculate_hash uses when none is given: the fastest one available
+# here. Record it alongside stored digests, since it differs between hosts.
+DEFAULT_HASH_ALGO = "blake3" if _blake3 is not None else "blake2b"
+
+# Units and divisors used by format_file_size
+_SIZE_UNITS = ("B", "KB", "MB", "GB")
+_SIZE_DIVISORS = (1, 1024, 1024 ** 2, 1024 ** 3)
 
-# Define common video file extensions and their MIME types
-VIDEO_EXTENSIONS = {
+# Define common video file extensions and their MIME types (read-only)
+VIDEO_EXTENSIONS = MappingProxyType({
     '.mp4': 'video/mp4',
     '.mov': 'video/quicktime',
     '.avi': 'video/x-msvideo',
@@ -42,7 +64,44 @@ VIDEO_EXTENSIONS = {
     '.mts': 'video/mp2t',  # AVCHD video format
     '.ts': 'video/mp2t',  # MPEG Transport Stream
     '.vob': 'video/dvd',  # DVD Video Object
-}
+})
+
+# Known video extensions, for membership checks
+VIDEO_EXT_SET = frozenset(VIDEO_EXTENSIONS)
+
+# ISO base media files start with an 'ftyp' box
+_ISO_BMFF_SIGNATURES = ((4, b"ftyp"),)
+
+# Container signatures per extension: the file must match all (offset, magic bytes)
+# pairs of at least one entry listed for its extension
+VIDEO_SIGNATURES = MappingProxyType({
+    '.mp4': (_ISO_BMFF_SIGNATURES,),
+    '.m4v': (_ISO_BMFF_SIGNATURES,),
+    '.3gp': (_ISO_BMFF_SIGNATURES,),
+    '.3g2': (_ISO_BMFF_SIGNATURES,),
+    # QuickTime files written before 'ftyp' existed start with another top-level atom
+    '.mov': (_ISO_BMFF_SIGNATURES, ((4, b"moov"),), ((4, b"mdat"),), ((4, b"wide"),),
+             ((4, b"free"),), ((4, b"skip"),)),
+    '.mkv': (((0, b"\x1a\x45\xdf\xa3"),),),  # Matroska (EBML)
+    '.webm': (((0, b"\x1a\x45\xdf\xa3"),),),  # WebM (EBML)
+    '.avi': (((0, b"RIFF"), (8, b"AVI ")),),
+    '.wmv': (((0, b"\x30\x26\xb2\x75\x8e\x66\xcf\x11"),),),  # ASF
+    '.flv': (((0, b"FLV"),),),
+    '.mxf': (((0, b"\x06\x0e\x2b\x34"),),),  # SMPTE universal label
+    '.vob': (((0, b"\x00\x00\x01\xba"),),),  # MPEG program stream pack header
+    # Transport streams: a sync byte at the start of the first two 188-byte packets
+    '.ts': (((0, b"\x47"), (188, b"\x47")),),
+    # AVCHD: 192-byte packets, each with a 4-byte timecode before the sync byte
+    '.mts': (((4, b"\x47"), (196, b"\x47")),),
+})
+
+# Bytes read from the start of a file to match VIDEO_SIGNATURES
+SIGNATURE_READ_SIZE = max(
+    offset + len(magic)
+    for alternatives in VIDEO_SIGNATURES.values()
+    for signature in alternatives
+    for offset, magic in signature
+)
 
 
 def ensure_temp_dirs() -> None:
@@ -52,15 +111,17 @@ def ensure_temp_dirs() -> None:
     """
     os.makedirs(settings.temp_download_dir, exist_ok=True)
     os.makedirs(settings.temp_processing_dir, exist_ok=True)
-    logger.info(f"Temporary directories verified: {settings.temp_download_dir}, {settings.temp_processing_dir}")
+    logger.info("Temporary directories verified: %s, %s", settings.temp_download_dir, settings.temp_processing_dir)
 
 
-def get_file_info(file_path: str) -> Dict[str, any]:
+def get_file_info(file_path: str, compute_md5: bool = False) -> Dict[str, any]:
     """
     Get file information.
     
     Args:
         file_path: Path to the file
+        compute_md5: Whether to hash the file (files under 1GB only); this reads
+            the whole file, so it is off by default
         
     Returns:
         Dictionary with file information:
@@ -68,16 +129,18 @@ def get_file_info(file_path: str) -> Dict[str, any]:
             - path: Full path to the file
             - size: File size in bytes
             - size_human: Human-readable file size
-            - created: File creation time
-            - modified: File modification time
+            - created: File creation time (epoch seconds, see format_iso)
+            - modified: File modification time (epoch seconds, see format_iso)
             - extension: File extension
             - mime_type: File MIME type
-            - md5: MD5 hash of the file
+            - md5: MD5 hash of the file, None unless compute_md5 is set
     """
-    if not os.path.exists(file_path):
+    # A single stat both checks existence and provides size and times
+    try:
+        file_stat = os.stat(file_path)
+    except FileNotFoundError:
         raise FileNotFoundError(f"File not found: {file_path}")
-        
-    file_stat = os.stat(file_path)
+    
     file_size = file_stat.st_size
     file_name = os.path.basename(file_path)
     file_ext = os.path.splitext(file_name)[1].lower()
@@ -85,36 +148,47 @@ def get_file_info(file_path: str) -> Dict[str, any]:
     # Get MIME type
     mime_type = VIDEO_EXTENSIONS.get(file_ext)
     if not mime_type:
+        # mimetypes loads the system MIME database on first use, so
+        # processes that only see known video extensions never read it
         mime_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
     
-    # Calculate MD5 hash for files under 1GB
+    # Calculate MD5 hash for files under 1GB, if requested
     md5_hash = None
-    if file_size < 1_073_741_824:  # 1GB
+    if compute_md5 and file_size < 1_073_741_824:  # 1GB
         try:
             md5_hash = calculate_md5(file_path)
         except Exception as e:
-            logger.warning(f"Failed to calculate MD5 for {file_path}: {e}")
+            logger.warning("Failed to calculate MD5 for %s: %s", file_path, e)
     
     # Format human-readable size
     size_human = format_file_size(file_size)
     
-    # Get creation and modification times
-    created = datetime.datetime.fromtimestamp(file_stat.st_ctime)
-    modified = datetime.datetime.fromtimestamp(file_stat.st_mtime)
-    
     return {
         "name": file_name,
         "path": file_path,
         "size": file_size,
         "size_human": size_human,
-        "created": created,
-        "modified": modified,
+        "created": file_stat.st_ctime,
+        "modified": file_stat.st_mtime,
         "extension": file_ext,
         "mime_type": mime_type,
         "md5": md5_hash
     }
 
 
+def format_iso(timestamp: float) -> str:
+    """
+    Format an epoch timestamp (e.g. from get_file_info) as a local ISO 8601 string.
+    
+    Args:
+        timestamp: Seconds since the epoch
+        
+    Returns:
+        ISO 8601 date and time
+    """
+    return datetime.datetime.fromtimestamp(timestamp).isoformat()
+
+
 def format_file_size(size_bytes: int) -> str:
     """
     Format file size to human-readable format.
@@ -125,14 +199,65 @@ def format_file_size(size_bytes: int) -> str:
     Returns:
         Human-readable file size (e.g., "1.23 MB")
     """
-    if size_bytes < 1024:
+    # Each unit spans 10 bits: 1024 needs 11 bits, 1048576 needs 21, and so on
+    unit = min(max(size_bytes.bit_length() - 1, 0) // 10, 3)
+    if not unit:
         return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.2f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.2f} MB"
-    else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
+    return f"{size_bytes / _SIZE_DIVISORS[unit]:.2f} {_SIZE_UNITS[unit]}"
+
+
+def calculate_hash(file_path: str, algo: Optional[str] = None) -> str:
+    """
+    Calculate a hash of a file for integrity checks.
+    
+    Without an algorithm, DEFAULT_HASH_ALGO is used: BLAKE3 when the optional
+    blake3 package is installed, otherwise BLAKE2b, which is faster than MD5 on
+    64-bit CPUs. An explicit "blake3" requires the package. Any other hashlib
+    algorithm name (e.g. "md5", "sha256") is used as given.
+    
+    Args:
+        file_path: Path to the file
+        algo: Hash algorithm name, or None for DEFAULT_HASH_ALGO
+        
+    Returns:
+        Hash as a hexadecimal string
+        
+    Raises:
+        ImportError: If algo is "blake3" and the blake3 package isn't installed
+    """
+    if algo is None:
+        algo = DEFAULT_HASH_ALGO
+    
+    if algo == "blake3":
+        if _blake3 is None:
+            raise ImportError("BLAKE3 hashing requires the blake3 package")
+        hasher = _blake3(max_threads=_blake3.AUTO)
+    
+    with open(file_path, "rb", buffering=0) as f:
+        # Ask for aggressive readahead, and drop the pages afterwards so hashing
+        # a large file doesn't evict the rest of the page cache
+        fd = f.fileno()
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        
+        try:
+            if algo != "blake3" and hasattr(hashlib, "file_digest"):
+                # Python 3.11+: hashes in C with a large buffer, releasing the GIL
+                return hashlib.file_digest(f, algo).hexdigest()
+            
+            # blake3 and older Pythons: read into one reusable 1 MiB buffer
+            if algo != "blake3":
+                hasher = hashlib.new(algo)
+            buffer = memoryview(bytearray(HASH_BUFFER_SIZE))
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                hasher.update(buffer[:n])
+            return hasher.hexdigest()
+        finally:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
 
 
 def calculate_md5(file_path: str) -> str:
@@ -145,11 +270,7 @@ def calculate_md5(file_path: str) -> str:
     Returns:
         MD5 hash as a hexadecimal string
     """
-    hash_md5 = hashlib.md5()
-    with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hash_md5.update(chunk)
-    return hash_md5.hexdigest()
+    return calculate_hash(file_path, "md5")
 
 
 def validate_video_file(file_path: str) -> Tuple[bool, Optional[str]]:
@@ -162,18 +283,31 @@ def validate_video_file(file_path: str) -> Tuple[bool, Optional[str]]:
     Returns:
         Tuple with (is_valid, error_message)
     """
-    if not os.path.exists(file_path):
+    # A single stat both checks existence and provides the size
+    try:
+        file_size = os.stat(file_path).st_size
+    except FileNotFoundError:
         return False, f"File not found: {file_path}"
     
-    if os.path.getsize(file_path) == 0:
+    if file_size == 0:
         return False, f"File is empty: {file_path}"
     
     file_ext = os.path.splitext(file_path)[1].lower()
-    if file_ext not in VIDEO_EXTENSIONS:
+    if file_ext not in VIDEO_EXT_SET:
         # Check MIME type as fallback
         mime_type = mimetypes.guess_type(file_path)[0]
         if not mime_type or not mime_type.startswith("video/"):
             return False, f"File is not a recognized video format: {file_path}"
+    else:
+        # Check the container signature for the file's extension so junk downloads
+        # (e.g. HTML error pages) are rejected before they are uploaded
+        with open(file_path, "rb") as f:
+            head = f.read(SIGNATURE_READ_SIZE)
+        if not any(
+            all(head[offset:offset + len(magic)] == magic for offset, magic in signature)
+            for signature in VIDEO_SIGNATURES[file_ext]
+        ):
+            return False, f"File content is not a recognized {file_ext} container: {file_path}"
     
     # TODO: Add more sophisticated video validation if needed
     # For example, using a library like ffmpeg to check if the file is a valid video
@@ -203,11 +337,70 @@ def move_to_processing(download_path: str) -> str:
     
     # Move the file
     shutil.move(download_path, processing_path)
-    logger.info(f"Moved file to processing: {download_path} -> {processing_path}")
+    logger.info("Moved file to processing: %s -> %s", download_path, processing_path)
     
     return processing_path
 
 
+def stage_file(src: str, dst: str) -> str:
+    """
+    Place a copy of a file at a new path, avoiding copying its data where possible.
+    
+    Tries a hard link first (same filesystem), then a copy-on-write clone on
+    Linux filesystems that support it, and only then a full copy.
+    
+    Args:
+        src: Path to the source file
+        dst: Path to create
+        
+    Returns:
+        How the file was staged: "hardlink", "reflink" or "copy"
+    """
+    # Replace an existing destination, as shutil.copy2 would
+    if os.path.lexists(dst):
+        os.remove(dst)
+    
+    try:
+        os.link(src, dst)
+        return "hardlink"
+    except OSError as e:
+        logger.debug("Hard link %s -> %s not possible: %s", src, dst, e)
+    
+    if fcntl is not None:
+        try:
+            with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+                fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+            shutil.copystat(src, dst)
+            return "reflink"
+        except OSError as e:
+            logger.debug("Reflink %s -> %s not possible: %s", src, dst, e)
+            if os.path.lexists(dst):
+                os.remove(dst)
+    
+    shutil.copy2(src, dst)
+    return "copy"
+
+
+def _scan_dir(dir_path: str) -> List[os.DirEntry]:
+    """
+    List a directory's entries in one pass.
+    
+    A missing directory is treated as empty, which saves a separate
+    existence check per directory.
+    
+    Args:
+        dir_path: Directory to list
+        
+    Returns:
+        Directory entries (with cached type information)
+    """
+    try:
+        with os.scandir(dir_path) as entries:
+            return list(entries)
+    except FileNotFoundError:
+        return []
+
+
 def cleanup_temp_files(max_age_hours: int = 24) -> List[str]:
     """
     Clean up temporary files older than the specified age.
@@ -230,27 +423,43 @@ def cleanup_temp_files(max_age_hours: int = 24) -> List[str]:
     dirs_to_clean = [settings.temp_download_dir, settings.temp_processing_dir]
     
     for dir_path in dirs_to_clean:
-        if not os.path.exists(dir_path):
+        # scandir entries cache their type and stat results, saving a syscall per check
+        entries = _scan_dir(dir_path)
+        if not entries:
             continue
-            
-        for filename in os.listdir(dir_path):
-            file_path = os.path.join(dir_path, filename)
-            
-            # Skip directories
-            if os.path.isdir(file_path):
-                continue
+        
+        # Unlink by name relative to the open directory so the full path
+        # isn't resolved again for every file
+        dir_fd = None
+        if os.unlink in os.supports_dir_fd:
+            try:
+                dir_fd = os.open(dir_path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+            except OSError as e:
+                logger.debug("Could not open %s for cleanup: %s", dir_path, e)
+        
+        try:
+            for entry in entries:
+                # Skip directories
+                if entry.is_dir():
+                    continue
                 
-            # Check file age
-            file_modified_time = os.path.getmtime(file_path)
-            age_seconds = current_time - file_modified_time
-            
-            if age_seconds > max_age_seconds:
-                try:
-                    os.remove(file_path)
-                    deleted_files.append(file_path)
-                    logger.info(f"Deleted old temporary file: {file_path}")
-                except Exception as e:
-                    logger.error(f"Failed to delete {file_path}: {e}")
+                # Check file age
+                file_path = entry.path
+                age_seconds = current_time - entry.stat().st_mtime
+                
+                if age_seconds > max_age_seconds:
+                    try:
+                        if dir_fd is not None:
+                            os.unlink(entry.name, dir_fd=dir_fd)
+                        else:
+                            os.remove(file_path)
+                        deleted_files.append(file_path)
+                        logger.info("Deleted old temporary file: %s", file_path)
+                    except Exception as e:
+                        logger.error("Failed to delete %s: %s", file_path, e)
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
     
     return deleted_files
 
@@ -281,43 +490,27 @@ def get_temp_file_stats() -> Dict[str, any]:
     oldest_time = float('inf')
     newest_time = 0
     
-    # Check download directory
-    if os.path.exists(settings.temp_download_dir):
-        for filename in os.listdir(settings.temp_download_dir):
-            file_path = os.path.join(settings.temp_download_dir, filename)
-            if os.path.isfile(file_path):
-                stats["total_files"] += 1
-                stats["downloads"] += 1
-                
-                file_size = os.path.getsize(file_path)
-                stats["total_size"] += file_size
-                
-                mtime = os.path.getmtime(file_path)
-                if mtime < oldest_time:
-                    oldest_time = mtime
-                    stats["oldest_file"] = file_path
-                if mtime > newest_time:
-                    newest_time = mtime
-                    stats["newest_file"] = file_path
-    
-    # Check processing directory
-    if os.path.exists(settings.temp_processing_dir):
-        for filename in os.listdir(settings.temp_processing_dir):
-            file_path = os.path.join(settings.temp_processing_dir, filename)
-            if os.path.isfile(file_path):
-                stats["total_files"] += 1
-                stats["processing"] += 1
-                
-                file_size = os.path.getsize(file_path)
-                stats["total_size"] += file_size
-                
-                mtime = os.path.getmtime(file_path)
-                if mtime < oldest_time:
-                    oldest_time = mtime
-                    stats["oldest_file"] = file_path
-                if mtime > newest_time:
-                    newest_time = mtime
-                    stats["newest_file"] = file_path
+    # Check download and processing directories
+    for dir_path, dir_key in ((settings.temp_download_dir, "downloads"),
+                              (settings.temp_processing_dir, "processing")):
+        for entry in _scan_dir(dir_path):
+            if not entry.is_file():
+                continue
+            
+            stats["total_files"] += 1
+            stats[dir_key] += 1
+            
+            # One cached stat provides both size and modification time
+            file_stat = entry.stat()
+            stats["total_size"] += file_stat.st_size
+            
+            mtime = file_stat.st_mtime
+            if mtime < oldest_time:
+                oldest_time = mtime
+                stats["oldest_file"] = entry.path
+            if mtime > newest_time:
+                newest_time = mtime
+                stats["newest_file"] = entry.path
     
     # Add human-readable size
     stats["total_size_human"] = format_file_size(stats["total_size"])
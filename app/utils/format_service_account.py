@@ -11,10 +11,65 @@ Example:
     python -m app.utils.format_service_account ./credentials/service-account.json
 """
 
+import functools
 import json
+import mmap
+import os
+import re
 import sys
 import argparse
 from pathlib import Path
+from typing import Union
+
+# Parser picked once at import: orjson when it is installed, else the stdlib
+try:
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
+
+# A JSON string literal (kept as written) or a run of whitespace between tokens (dropped)
+_STRING_OR_WHITESPACE_RE = re.compile(r'("[^"\\]*(?:\\.[^"\\]*)*")|[ \t\n\r]+')
+
+
+def _compact(text: str) -> str:
+    """
+    Remove the whitespace between the tokens of valid JSON text.
+    
+    The text is scanned once and string literals are copied through unchanged, so
+    the parsed value never has to be serialized again.
+    """
+    # Text without any whitespace is already compact; return it without a scan
+    if ' ' not in text and '\n' not in text and '\t' not in text and '\r' not in text:
+        return text
+    return _STRING_OR_WHITESPACE_RE.sub(r'\1', text)
+
+
+@functools.lru_cache(maxsize=32)
+def _format_file_cached(json_file_path: str, mtime_ns: int, size: int) -> str:
+    """
+    Read, validate and format a JSON key file.
+    
+    mtime_ns and size are only part of the cache key: a file that changes on disk
+    gets a new key and is formatted again.
+    """
+    # Read the JSON file, decoding straight from a memory map rather than
+    # copying the contents into a bytes object first (empty files can't be mapped)
+    with open(json_file_path, 'rb') as f:
+        if size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                text = str(mapped, 'utf-8-sig')
+        else:
+            text = ''
+    
+    # Make sure the file is valid JSON before reformatting it
+    _loads(text)
+    
+    # Convert to a properly formatted string for .env file
+    env_value = _compact(text)
+    
+    # Return the formatted string
+    return f"GOOGLE_SERVICE_ACCOUNT_INFO={env_value}"
 
 
 def format_service_account_json(json_file_path: str) -> str:
@@ -28,15 +83,9 @@ def format_service_account_json(json_file_path: str) -> str:
         Formatted string for .env file
     """
     try:
-        # Read the JSON file
-        with open(json_file_path, 'r') as f:
-            service_account_info = json.load(f)
-        
-        # Convert to a properly formatted string for .env file
-        env_value = json.dumps(service_account_info, separators=(',', ':'))
-        
-        # Return the formatted string
-        return f"GOOGLE_SERVICE_ACCOUNT_INFO={env_value}"
+        # Key the cache on the file's metadata so an edited file is read again
+        st = os.stat(json_file_path)
+        return _format_file_cached(json_file_path, st.st_mtime_ns, st.st_size)
     except json.JSONDecodeError:
         print(f"Error: The file {json_file_path} is not valid JSON.")
         return ""
@@ -48,22 +97,24 @@ def format_service_account_json(json_file_path: str) -> str:
         return ""
 
 
-def format_from_string(json_string: str) -> str:
+def format_from_string(json_string: Union[str, bytes]) -> str:
     """
     Format a Google Service Account JSON string for use in a .env file.
     
     Args:
-        json_string: JSON string to format
+        json_string: JSON string (or UTF-8 bytes) to format
         
     Returns:
         Formatted string for .env file
     """
     try:
-        # Parse the JSON string
-        service_account_info = json.loads(json_string)
+        # Make sure the string is valid JSON before reformatting it
+        _loads(json_string)
+        if isinstance(json_string, bytes):
+            json_string = json_string.decode('utf-8-sig')
         
         # Convert to a properly formatted string for .env file
-        env_value = json.dumps(service_account_info, separators=(',', ':'))
+        env_value = _compact(json_string)
         
         # Return the formatted string
         return f"GOOGLE_SERVICE_ACCOUNT_INFO={env_value}"
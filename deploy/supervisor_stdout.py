@@ -22,14 +22,17 @@ def event_handler(event, response):
     response.flush()
 
 def main():
+    # Read the raw byte stream: its BufferedReader already batches the read
+    # syscalls, and the 'len' header counts bytes rather than characters
+    stdin = sys.stdin.buffer
     while True:
         try:
-            header_line = sys.stdin.readline()
+            header_line = stdin.readline().decode('utf-8', 'replace')
             if not header_line:
                 break
-            headers = dict([x.split(':') for x in header_line.split()])
-            data = sys.stdin.read(int(headers['len']))
-            event = dict([x.split(':') for x in data.split()])
+            headers = dict(x.partition(':')[::2] for x in header_line.split())
+            data = stdin.read(int(headers['len'])).decode('utf-8', 'replace')
+            event = dict(x.partition(':')[::2] for x in data.split())
             response = sys.stdout
             event_handler(event, response)
         except KeyboardInterrupt:
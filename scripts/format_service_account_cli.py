@@ -20,6 +20,14 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 # Import the utility function
 from app.utils.format_service_account import format_service_account_json, format_from_string
 
+# Command-line options that take a value, mapped to their option name
+OPTION_KEYS = {
+    "--output": "output",
+    "-o": "output",
+    "--string": "string",
+    "-s": "string",
+}
+
 
 def print_usage():
     """Print usage instructions."""
@@ -41,37 +49,38 @@ def main():
         print_usage()
         return
     
-    # Check for output file option
-    output_file = None
-    if "--output" in args or "-o" in args:
-        try:
-            output_index = args.index("--output") if "--output" in args else args.index("-o")
-            output_file = args[output_index + 1]
-            # Remove output option and value from args
-            args.pop(output_index)
-            args.pop(output_index)
-        except (IndexError, ValueError):
+    # Collect options and positional arguments in a single pass
+    opts = {"output": None, "string": None}
+    positional = []
+    i = 0
+    while i < len(args):
+        key = OPTION_KEYS.get(args[i])
+        if key is None:
+            positional.append(args[i])
+        elif i + 1 < len(args):
+            opts[key] = args[i + 1]
+            i += 1
+        elif key == "output":
             print("Error: --output option requires a file path")
             return
-    
-    # Check for string option
-    if "--string" in args or "-s" in args:
-        try:
-            string_index = args.index("--string") if "--string" in args else args.index("-s")
-            json_string = args[string_index + 1]
-            # Format from string
-            formatted_string = format_from_string(json_string)
-        except (IndexError, ValueError):
+        else:
             print("Error: --string option requires a JSON string")
             return
+        i += 1
+    
+    output_file = opts["output"]
+    
+    if opts["string"] is not None:
+        # Format from string
+        formatted_string = format_from_string(opts["string"])
     else:
         # Format from file
-        if not args:
+        if not positional:
             print("Error: No JSON file path provided")
             print_usage()
             return
         
-        json_file_path = args[0]
+        json_file_path = positional[0]
         formatted_string = format_service_account_json(json_file_path)
     
     if formatted_string:
@@ -21,21 +21,26 @@ def install_browsers_cli():
     It's the recommended way to install browsers.
     """
     print("Installing Playwright browsers using CLI...")
-    try:
-        # Run the playwright install command
-        result = subprocess.run(
-            ["playwright", "install", "--with-deps", "chromium"],
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        print(f"Installation output: {result.stdout}")
-        print("Playwright browsers installed successfully using CLI.")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"Error installing browsers using CLI: {e}")
-        print(f"Error output: {e.stderr}")
+    # Run the playwright install command, streaming its output as it arrives
+    # instead of holding the whole install log in memory
+    proc = subprocess.Popen(
+        ["playwright", "install", "--with-deps", "chromium"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1
+    )
+    for line in proc.stdout:
+        sys.stdout.write(line)
+    proc.stdout.close()
+    
+    returncode = proc.wait()
+    if returncode != 0:
+        print(f"Error installing browsers using CLI: exit status {returncode}")
         return False
+    
+    print("Playwright browsers installed successfully using CLI.")
+    return True
 
 
 async def install_browsers_api():
@@ -73,16 +78,22 @@ async def main():
     """
     Main function to install Playwright browsers.
     
-    First tries to install using the CLI, then falls back to the API if needed.
+    Runs the CLI and API installers concurrently; the first to succeed wins and the
+    other is cancelled. Playwright locks its browser directory while installing, so
+    the two never write the same browser at once.
     """
-    # Try CLI method first
-    if install_browsers_cli():
-        return
+    pending = {
+        asyncio.create_task(asyncio.to_thread(install_browsers_cli)),
+        asyncio.create_task(install_browsers_api()),
+    }
     
-    # Fall back to API method if CLI fails
-    print("CLI installation failed, trying API method...")
-    if await install_browsers_api():
-        return
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        if any(not task.exception() and task.result() for task in done):
+            # A running CLI install can't be interrupted; asyncio.run waits for it
+            for task in pending:
+                task.cancel()
+            return
     
     # If both methods fail, exit with error
     print("Failed to install Playwright browsers using both methods.")
@@ -6,15 +6,38 @@ and asset pages to understand their DOM structure for automation.
 """
 
 import os
+import sys
 import asyncio
 import json
 from pathlib import Path
 from playwright.async_api import async_playwright
 
+try:
+    import orjson
+except ImportError:  # Optional; falls back to the stdlib json module
+    orjson = None
+
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
 
+# Status messages collected until the end of the current phase
+_log_buf = []
+
+
+def log(msg):
+    """Queue a status message for the next flush_log()."""
+    _log_buf.append(msg)
+
+
+def flush_log():
+    """Write all queued status messages to stdout in a single call."""
+    if _log_buf:
+        sys.stdout.write("\n".join(_log_buf) + "\n")
+        sys.stdout.flush()
+        _log_buf.clear()
+
+
 # Get credentials from environment variables
 FRAME_IO_EMAIL = os.getenv("FRAME_IO_EMAIL")
 FRAME_IO_PASSWORD = os.getenv("FRAME_IO_PASSWORD")
@@ -23,10 +46,54 @@ FRAME_IO_PASSWORD = os.getenv("FRAME_IO_PASSWORD")
 LOGIN_URL = "https://app.frame.io/login"
 SAMPLE_ASSET_URL = "https://f.io/TafALVxa"  # Replace with a valid Frame.io asset URL
 
+# Different selectors that might match the download button
+DOWNLOAD_BUTTON_SELECTORS = [
+    'button:has-text("Download")',
+    '[aria-label="Download"]',
+    '[title="Download"]',
+    '.download-button',
+    '.btn-download'
+]
+
 # Output directory for screenshots and DOM info
 OUTPUT_DIR = Path("research_output")
 OUTPUT_DIR.mkdir(exist_ok=True)
 
+# Saved login session (cookies and local storage) reused between runs. It holds
+# live credentials, so it is kept in the user's cache directory, outside the repo
+AUTH_STATE_DIR = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "frameio-research"
+AUTH_STATE_PATH = AUTH_STATE_DIR / "auth_state.json"
+
+# Directory descriptor for the output directory, so each write skips resolving
+# its path again (None where opening relative to a directory fd is unsupported)
+OUTPUT_DIR_FD = (
+    os.open(OUTPUT_DIR, os.O_RDONLY | os.O_DIRECTORY)
+    if os.open in os.supports_dir_fd else None
+)
+
+
+def _write_output(filename, data):
+    """Write bytes to a file in the output directory."""
+    if OUTPUT_DIR_FD is None:
+        (OUTPUT_DIR / filename).write_bytes(data)
+        return
+    
+    fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644, dir_fd=OUTPUT_DIR_FD)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _write_json(filename, data):
+    """Write data to the output directory as indented JSON."""
+    if orjson is not None:
+        _write_output(filename, orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        _write_output(filename, json.dumps(data, indent=2).encode())
+
 
 async def save_dom_info(page, filename):
     """
@@ -39,43 +106,33 @@ async def save_dom_info(page, filename):
     # Get the HTML content
     html = await page.content()
     
-    # Get all input fields
-    input_fields = await page.evaluate("""
+    # Collect the inputs, buttons and forms in a single round trip to the browser
+    input_fields, buttons, forms = await page.evaluate("""
         () => {
             const inputs = Array.from(document.querySelectorAll('input'));
-            return inputs.map(input => ({
-                id: input.id,
-                name: input.name,
-                type: input.type,
-                placeholder: input.placeholder,
-                className: input.className
-            }));
-        }
-    """)
-    
-    # Get all buttons
-    buttons = await page.evaluate("""
-        () => {
             const buttons = Array.from(document.querySelectorAll('button'));
-            return buttons.map(button => ({
-                id: button.id,
-                text: button.textContent.trim(),
-                className: button.className,
-                disabled: button.disabled
-            }));
-        }
-    """)
-    
-    # Get all forms
-    forms = await page.evaluate("""
-        () => {
             const forms = Array.from(document.querySelectorAll('form'));
-            return forms.map(form => ({
-                id: form.id,
-                action: form.action,
-                method: form.method,
-                className: form.className
-            }));
+            return [
+                inputs.map(input => ({
+                    id: input.id,
+                    name: input.name,
+                    type: input.type,
+                    placeholder: input.placeholder,
+                    className: input.className
+                })),
+                buttons.map(button => ({
+                    id: button.id,
+                    text: button.textContent.trim(),
+                    className: button.className,
+                    disabled: button.disabled
+                })),
+                forms.map(form => ({
+                    id: form.id,
+                    action: form.action,
+                    method: form.method,
+                    className: form.className
+                }))
+            ];
         }
     """)
     
@@ -88,10 +145,10 @@ async def save_dom_info(page, filename):
         "forms": forms
     }
     
-    with open(OUTPUT_DIR / f"{filename}.json", "w") as f:
-        json.dump(dom_info, f, indent=2)
+    # Write the file in a worker thread so the event loop keeps serving the browser
+    await asyncio.to_thread(_write_json, f"{filename}.json", dom_info)
     
-    print(f"DOM info saved to {filename}.json")
+    log(f"DOM info saved to {filename}.json")
 
 
 async def take_screenshot(page, filename):
@@ -102,162 +159,183 @@ async def take_screenshot(page, filename):
         page: Playwright page object
         filename: Name of the file to save the screenshot to
     """
-    await page.screenshot(path=OUTPUT_DIR / f"{filename}.png", full_page=True)
-    print(f"Screenshot saved to {filename}.png")
+    screenshot = await page.screenshot(full_page=True)
+    await asyncio.to_thread(_write_output, f"{filename}.png", screenshot)
+    log(f"Screenshot saved to {filename}.png")
 
 
-async def analyze_login_page():
+async def analyze_login_page(page):
     """
     Analyze the Frame.io login page.
+    
+    Args:
+        page: Playwright page object
     """
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        context = await browser.new_context()
-        page = await context.new_page()
-        
-        # Navigate to the login page
-        print(f"Navigating to {LOGIN_URL}")
-        await page.goto(LOGIN_URL)
-        try:
-            await page.wait_for_load_state("networkidle", timeout=10000)
-        except Exception as e:
-            print(f"Warning: Timeout waiting for networkidle: {e}")
-        
-        # Take a screenshot and save DOM info
-        await take_screenshot(page, "login_page")
-        await save_dom_info(page, "login_page")
+    # Navigate to the login page
+    log(f"Navigating to {LOGIN_URL}")
+    await page.goto(LOGIN_URL, wait_until="domcontentloaded")
+    try:
+        await page.wait_for_selector('input[type="email"]', timeout=10000)
+    except Exception as e:
+        log(f"Warning: Timeout waiting for the login form: {e}")
+    
+    # Take a screenshot and save DOM info concurrently
+    await asyncio.gather(take_screenshot(page, "login_page"), save_dom_info(page, "login_page"))
+    
+    # Analyze the login form
+    log("Analyzing login form...")
+    
+    # Find the email and password fields
+    email_field = await page.query_selector('input[type="email"]')
+    password_field = await page.query_selector('input[type="password"]')
+    
+    if email_field and password_field:
+        log("Found email and password fields")
         
-        # Analyze the login form
-        print("Analyzing login form...")
+        # Get the selectors
+        email_selector = await page.evaluate("el => el.outerHTML", email_field)
+        password_selector = await page.evaluate("el => el.outerHTML", password_field)
         
-        # Find the email and password fields
-        email_field = await page.query_selector('input[type="email"]')
-        password_field = await page.query_selector('input[type="password"]')
+        log(f"Email field: {email_selector}")
+        log(f"Password field: {password_selector}")
         
-        if email_field and password_field:
-            print("Found email and password fields")
-            
-            # Get the selectors
-            email_selector = await page.evaluate("el => el.outerHTML", email_field)
-            password_selector = await page.evaluate("el => el.outerHTML", password_field)
-            
-            print(f"Email field: {email_selector}")
-            print(f"Password field: {password_selector}")
-            
-            # Find the login button
-            login_button = await page.query_selector('button[type="submit"]')
-            if login_button:
-                login_button_html = await page.evaluate("el => el.outerHTML", login_button)
-                print(f"Login button: {login_button_html}")
-            else:
-                print("Login button not found")
+        # Find the login button
+        login_button = await page.query_selector('button[type="submit"]')
+        if login_button:
+            login_button_html = await page.evaluate("el => el.outerHTML", login_button)
+            log(f"Login button: {login_button_html}")
         else:
-            print("Email or password field not found")
-        
-        # Close the browser
-        await browser.close()
+            log("Login button not found")
+    else:
+        log("Email or password field not found")
+    
+    flush_log()
 
 
-async def analyze_asset_page():
+async def analyze_asset_page(page):
     """
     Analyze a Frame.io asset page.
     
-    This requires logging in first, then navigating to the asset page.
+    This requires logging in first, then navigating to the asset page. Login is
+    skipped when the page's context already carries a saved session.
+    
+    Args:
+        page: Playwright page object
     """
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        context = await browser.new_context()
-        page = await context.new_page()
+    # Navigate to the login page
+    log(f"Navigating to {LOGIN_URL}")
+    await page.goto(LOGIN_URL, wait_until="domcontentloaded")
+    
+    # Log in, unless the saved session already redirected away from the login page;
+    # fill() waits for the form fields itself
+    if "login" in page.url:
+        log("Logging in...")
+        await page.fill('input[type="email"]', FRAME_IO_EMAIL)
+        await page.fill('input[type="password"]', FRAME_IO_PASSWORD)
+        await page.click('button[type="submit"]')
         
-        # Navigate to the login page
-        print(f"Navigating to {LOGIN_URL}")
-        await page.goto(LOGIN_URL)
+        # Wait for the redirect away from the login page
         try:
-            await page.wait_for_load_state("networkidle", timeout=10000)
+            await page.wait_for_url(lambda url: "login" not in url, timeout=10000)
         except Exception as e:
-            print(f"Warning: Timeout waiting for networkidle: {e}")
+            log(f"Warning: Timeout waiting for redirect after login: {e}")
+    
+    # Check if login was successful
+    if "login" not in page.url:
+        log("Login successful")
         
-        # Log in
-        print("Logging in...")
-        await page.fill('input[type="email"]', FRAME_IO_EMAIL)
-        await page.fill('input[type="password"]', FRAME_IO_PASSWORD)
-        await page.click('button[type="submit"]')
+        # Save the session so the next run can skip logging in, readable only by the user
+        AUTH_STATE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        await page.context.storage_state(path=AUTH_STATE_PATH)
+        AUTH_STATE_PATH.chmod(0o600)
         
-        # Wait for navigation to complete
+        # Navigate to the asset page
+        log(f"Navigating to {SAMPLE_ASSET_URL}")
+        await page.goto(SAMPLE_ASSET_URL, wait_until="domcontentloaded")
         try:
-            await page.wait_for_load_state("networkidle", timeout=10000)
+            await page.wait_for_selector(", ".join(DOWNLOAD_BUTTON_SELECTORS), timeout=10000)
         except Exception as e:
-            print(f"Warning: Timeout waiting for networkidle after login: {e}")
+            log(f"Warning: Timeout waiting for a download button on asset page: {e}")
         
-        # Check if login was successful
-        if "login" not in page.url:
-            print("Login successful")
-            
-            # Navigate to the asset page
-            print(f"Navigating to {SAMPLE_ASSET_URL}")
-            await page.goto(SAMPLE_ASSET_URL)
-            try:
-                await page.wait_for_load_state("networkidle", timeout=10000)
-            except Exception as e:
-                print(f"Warning: Timeout waiting for networkidle on asset page: {e}")
-            
-            # Take a screenshot and save DOM info
-            await take_screenshot(page, "asset_page")
-            await save_dom_info(page, "asset_page")
+        # Take a screenshot and save DOM info concurrently
+        await asyncio.gather(take_screenshot(page, "asset_page"), save_dom_info(page, "asset_page"))
+        
+        # Look for download button
+        log("Looking for download button...")
+        
+        # Try the selectors in order inside the page, in a single round trip.
+        # Playwright's :has-text() isn't CSS, so it is matched by hand.
+        found = await page.evaluate("""
+            (selectors) => {
+                for (const selector of selectors) {
+                    const hasText = selector.match(/^(.*):has-text\\("(.*)"\\)$/);
+                    const element = hasText
+                        ? Array.from(document.querySelectorAll(hasText[1])).find(
+                            el => el.textContent.toLowerCase().includes(hasText[2].toLowerCase()))
+                        : document.querySelector(selector);
+                    if (element) {
+                        return {selector, html: element.outerHTML};
+                    }
+                }
+                return null;
+            }
+        """, DOWNLOAD_BUTTON_SELECTORS)
+        
+        if found:
+            log(f"Found download button with selector '{found['selector']}': {found['html']}")
+        else:
+            log("Download button not found with common selectors")
             
-            # Look for download button
-            print("Looking for download button...")
+            # Find all buttons and links on the page, filtering them in the
+            # browser so only the likely download elements come back
+            button_count, link_count, candidates = await page.evaluate("""
+                () => {
+                    const buttons = Array.from(document.querySelectorAll('button'));
+                    const links = Array.from(document.querySelectorAll('a'));
+                    const candidates = buttons.concat(links)
+                        .filter(el => /download/i.test(el.textContent))
+                        .map(el => el.outerHTML);
+                    return [buttons.length, links.length, candidates];
+                }
+            """)
             
-            # Try different selectors that might match the download button
-            download_button_selectors = [
-                'button:has-text("Download")',
-                '[aria-label="Download"]',
-                '[title="Download"]',
-                '.download-button',
-                '.btn-download'
-            ]
+            log(f"Found {button_count} buttons and {link_count} links on the page")
             
-            for selector in download_button_selectors:
-                download_button = await page.query_selector(selector)
-                if download_button:
-                    download_button_html = await page.evaluate("el => el.outerHTML", download_button)
-                    print(f"Found download button with selector '{selector}': {download_button_html}")
-                    break
-            else:
-                print("Download button not found with common selectors")
-                
-                # Try to find all buttons and links on the page
-                buttons = await page.query_selector_all("button")
-                links = await page.query_selector_all("a")
-                
-                print(f"Found {len(buttons)} buttons and {len(links)} links on the page")
-                
-                # Look for elements that might be related to download
-                for element in buttons + links:
-                    text = await page.evaluate("el => el.textContent", element)
-                    if "download" in text.lower():
-                        element_html = await page.evaluate("el => el.outerHTML", element)
-                        print(f"Found potential download element: {element_html}")
-        else:
-            print("Login failed")
-        
-        # Close the browser
-        await browser.close()
+            # Look for elements that might be related to download
+            for element_html in candidates:
+                log(f"Found potential download element: {element_html}")
+    else:
+        log("Login failed")
+    
+    flush_log()
 
 
 async def main():
     """
     Main function to run the research.
     """
-    print("Researching Frame.io login process and DOM structure...")
+    log("Researching Frame.io login process and DOM structure...")
+    flush_log()
     
-    # Analyze the login page
-    await analyze_login_page()
-    
-    # Analyze an asset page
-    await analyze_asset_page()
+    # Launch the browser once and share it between both analyses
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=False)
+        
+        # Analyze the login page in a fresh context, so the login form is shown
+        context = await browser.new_context()
+        await analyze_login_page(await context.new_page())
+        await context.close()
+        
+        # Analyze an asset page, reusing the session saved by a previous run
+        storage_state = AUTH_STATE_PATH if AUTH_STATE_PATH.exists() else None
+        context = await browser.new_context(storage_state=storage_state)
+        await analyze_asset_page(await context.new_page())
+        
+        # Close the browser
+        await browser.close()
     
-    print("Research completed. Check the research_output directory for results.")
+    log("Research completed. Check the research_output directory for results.")
+    flush_log()
 
 
 if __name__ == "__main__":
@@ -11,9 +11,6 @@ def test_process_frame_url_success(client):
     This test verifies that the endpoint correctly accepts a valid Frame.io URL,
     creates a processing job, and returns the expected response.
     """
-    # Clear any existing processing jobs
-    processing_jobs.clear()
-    
     # Test data
     test_data = {
         "frame_io_url": "https://f.io/20zfIQ5x",
@@ -48,9 +45,6 @@ def test_process_frame_url_without_folder_id(client):
     This test verifies that the endpoint correctly handles the case where
     no drive_folder_id is provided and uses the default from settings.
     """
-    # Clear any existing processing jobs
-    processing_jobs.clear()
-    
     # Test data (without drive_folder_id)
     test_data = {
         "frame_io_url": "https://f.io/FDY4eFZJ"
@@ -106,9 +100,6 @@ def test_get_job_status_success(client):
     This test verifies that the endpoint correctly returns the status
     of an existing processing job.
     """
-    # Clear any existing processing jobs
-    processing_jobs.clear()
-    
     # Create a test job
     test_job_id = "test-job-123"
     processing_jobs[test_job_id] = {
@@ -137,9 +128,6 @@ def test_get_job_status_not_found(client):
     This test verifies that the endpoint correctly handles the case
     where the requested job ID does not exist.
     """
-    # Clear any existing processing jobs
-    processing_jobs.clear()
-    
     # Send request for non-existent job
     non_existent_id = "non-existent-job"
     response = client.get(f"/api/job/{non_existent_id}")
@@ -27,7 +27,8 @@ logger = logging.getLogger(__name__)
 # Test configuration
 BASE_URL = "http://localhost:8000"
 MAX_POLLING_TIME = 10 * 60  # 10 minutes maximum polling time
-POLLING_INTERVAL = 10  # Check status every 10 seconds
+POLLING_INTERVAL = 10  # Check status at least every 10 seconds
+INITIAL_POLLING_DELAY = 1  # First recheck after 1 second, doubling up to POLLING_INTERVAL
 
 # Test cases - each entry is a tuple of (frame_io_url, google_drive_subfolder)
 TEST_CASES = [
@@ -102,6 +103,10 @@ async def poll_until_complete(client: httpx.AsyncClient, job_id: str) -> Dict[st
     """
     Poll the job status until it completes or fails.
     
+    The delay between checks starts at INITIAL_POLLING_DELAY and doubles after
+    each check, up to POLLING_INTERVAL, so short jobs are noticed quickly without
+    long jobs being polled more often.
+    
     Args:
         client: The httpx client
         job_id: The ID of the job to check
@@ -111,6 +116,8 @@ async def poll_until_complete(client: httpx.AsyncClient, job_id: str) -> Dict[st
     """
     start_time = time.time()
     last_progress = -1
+    prev_state = None
+    delay = INITIAL_POLLING_DELAY
     
     while True:
         # Check if we've exceeded maximum polling time
@@ -121,7 +128,7 @@ async def poll_until_complete(client: httpx.AsyncClient, job_id: str) -> Dict[st
         status_data = await check_job_status(client, job_id)
         
         # Print full response the first time and whenever state changes
-        if start_time == time.time() or 'state' not in locals() or locals().get('prev_state') != status_data.get('state'):
+        if prev_state is None or prev_state != status_data.get('state'):
             logger.info(f"Full response data: {status_data}")
             prev_state = status_data.get('state')
             
@@ -147,28 +154,25 @@ async def poll_until_complete(client: httpx.AsyncClient, job_id: str) -> Dict[st
             logger.error(f"Job {job_id} failed: {status_data.get('error', 'Unknown error')}")
             return status_data
         
-        # Wait before polling again
-        await asyncio.sleep(POLLING_INTERVAL)
+        # Wait before polling again, backing off exponentially
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, POLLING_INTERVAL)
 
 
-@pytest.mark.asyncio
-@pytest.mark.parametrize(
-    "frame_io_url,google_drive_subfolder,test_name",
-    TEST_CASES,
-    ids=[case[2] for case in TEST_CASES]
-)
-async def test_frame_io_to_drive_workflow(
+async def _run_case(
+    client: httpx.AsyncClient,
     frame_io_url: str, 
     google_drive_subfolder: str, 
     test_name: str
 ) -> None:
     """
-    Test the complete Frame.io to Google Drive workflow through the API.
+    Run one Frame.io to Google Drive workflow case through the API.
     
-    This test submits a job to process a Frame.io URL, polls until completion,
+    This submits a job to process a Frame.io URL, polls until completion,
     and verifies the results include a shareable link.
     
     Args:
+        client: The httpx client, shared between cases
         frame_io_url: The Frame.io URL to process
         google_drive_subfolder: The Google Drive subfolder name
         test_name: A descriptive name for the test case
@@ -179,55 +183,78 @@ async def test_frame_io_to_drive_workflow(
     # Define expected outcomes based on URL
     is_valid_url = "f.io/" in frame_io_url or "frame.io/" in frame_io_url or "frameio.com/" in frame_io_url
     
-    async with httpx.AsyncClient(timeout=30.0, verify=False) as client:
-        try:
-            # Step 1: Submit the job
-            logger.info("Submitting job...")
-            
-            # For invalid URL test case, we expect a validation error
-            if not is_valid_url:
-                with pytest.raises(httpx.HTTPStatusError) as excinfo:
-                    response = await submit_job(client, frame_io_url, google_drive_subfolder)
-                assert excinfo.value.response.status_code == 422
-                logger.info("Validation correctly rejected invalid URL")
-                return
-                
-            # For valid URLs, we proceed with the normal flow
-            job_data = await submit_job(client, frame_io_url, google_drive_subfolder)
+    try:
+        # Step 1: Submit the job
+        logger.info(f"[{test_name}] Submitting job...")
+        
+        # For invalid URL test case, we expect a validation error
+        if not is_valid_url:
+            with pytest.raises(httpx.HTTPStatusError) as excinfo:
+                response = await submit_job(client, frame_io_url, google_drive_subfolder)
+            assert excinfo.value.response.status_code == 422
+            logger.info(f"[{test_name}] Validation correctly rejected invalid URL")
+            return
             
-            assert 'processing_id' in job_data, "Response should contain a processing_id"
-            job_id = job_data['processing_id']
-            logger.info(f"Job submitted successfully. ID: {job_id}")
+        # For valid URLs, we proceed with the normal flow
+        job_data = await submit_job(client, frame_io_url, google_drive_subfolder)
+        
+        assert 'processing_id' in job_data, "Response should contain a processing_id"
+        job_id = job_data['processing_id']
+        logger.info(f"[{test_name}] Job submitted successfully. ID: {job_id}")
+        
+        # Step 2: Poll until complete or failed
+        logger.info(f"[{test_name}] Polling job {job_id} until completion...")
+        final_status = await poll_until_complete(client, job_id)
+        
+        # Step 3: Verify results
+        if google_drive_subfolder:
+            # For normal cases with valid subfolder name
+            status_state = str(final_status.get('state', ''))
+            assert 'COMPLETED' in status_state, f"Job should complete successfully, but got state: '{status_state}', error: {final_status.get('error', 'unknown error')}"
+            assert 'share_link' in final_status, "Response should contain a share_link"
+            assert str(final_status['share_link']).startswith("https://drive.google.com/"), "Share link should be a Google Drive URL"
+            assert 'file_info' in final_status, "Response should contain file_info"
+            assert 'size_mb' in final_status['file_info'], "File info should include size_mb"
             
-            # Step 2: Poll until complete or failed
-            logger.info(f"Polling job {job_id} until completion...")
-            final_status = await poll_until_complete(client, job_id)
+            logger.info(f"[{test_name}] Test passed! Share link: {final_status['share_link']}")
+        else:
+            # For empty subfolder case, we should still get success but may have a default folder name
+            assert 'state' in final_status, "Response should contain state"
+            logger.info(f"[{test_name}] Empty subfolder test resulted in state: {final_status['state']}")
             
-            # Step 3: Verify results
-            if google_drive_subfolder:
-                # For normal cases with valid subfolder name
-                status_state = str(final_status.get('state', ''))
-                assert 'COMPLETED' in status_state, f"Job should complete successfully, but got state: '{status_state}', error: {final_status.get('error', 'unknown error')}"
-                assert 'share_link' in final_status, "Response should contain a share_link"
-                assert str(final_status['share_link']).startswith("https://drive.google.com/"), "Share link should be a Google Drive URL"
-                assert 'file_info' in final_status, "Response should contain file_info"
-                assert 'size_mb' in final_status['file_info'], "File info should include size_mb"
-                
-                logger.info(f"Test passed! Share link: {final_status['share_link']}")
-            else:
-                # For empty subfolder case, we should still get success but may have a default folder name
-                assert 'state' in final_status, "Response should contain state"
-                logger.info(f"Empty subfolder test resulted in state: {final_status['state']}")
-                
-        except httpx.RequestError as exc:
-            logger.error(f"Error while requesting {exc.request.url!r}: {exc}")
-            raise
-        except TimeoutError as exc:
-            logger.error(f"Timeout error: {exc}")
-            raise
-        except Exception as exc:
-            logger.error(f"Unexpected error: {exc}")
-            raise
+    except httpx.RequestError as exc:
+        logger.error(f"[{test_name}] Error while requesting {exc.request.url!r}: {exc}")
+        raise
+    except TimeoutError as exc:
+        logger.error(f"[{test_name}] Timeout error: {exc}")
+        raise
+    except Exception as exc:
+        logger.error(f"[{test_name}] Unexpected error: {exc}")
+        raise
+
+
+@pytest.mark.asyncio
+async def test_frame_io_to_drive_workflow() -> None:
+    """
+    Test the complete Frame.io to Google Drive workflow through the API.
+    
+    All TEST_CASES are submitted and polled concurrently over one shared client,
+    so the test takes about as long as the slowest case rather than the sum of
+    all of them. Every case runs to the end; failures are reported together.
+    """
+    async with httpx.AsyncClient(timeout=30.0, verify=False) as client:
+        results = await asyncio.gather(
+            *(_run_case(client, *case) for case in TEST_CASES),
+            return_exceptions=True
+        )
+    
+    # Report each failed case by name
+    failures = [
+        f"{case[2]}: {result!r}"
+        for case, result in zip(TEST_CASES, results)
+        if isinstance(result, BaseException)
+    ]
+    assert not failures, "Failed cases:\n" + "\n".join(failures)
 
 
 if __name__ == "__main__":
@@ -5,27 +5,36 @@ from app.main import app
 from app.api.endpoints import processing_jobs
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
     """
-    Create a test client for the FastAPI application.
+    Create a test client for the FastAPI application, shared by the whole session.
     
-    Returns:
+    The app keeps no state between requests apart from processing_jobs, which
+    clear_processing_jobs resets around every test.
+    
+    Yields:
         TestClient: A test client for the FastAPI application.
     """
     # Create a TestClient instance with the FastAPI app
-    # The app parameter is passed directly without a keyword
-    return TestClient(app)
+    # The app parameter is passed directly without a keyword; entering it runs
+    # the app's startup and shutdown once for the session
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture(autouse=True)
 def clear_processing_jobs():
     """
-    Clear the processing_jobs dictionary before each test.
+    Remove the jobs each test adds to the processing_jobs dictionary.
     
-    This fixture runs automatically before each test to ensure
-    a clean state for testing.
+    This fixture runs automatically around each test. The jobs present when the
+    test starts are recorded, and any others are removed once it finishes, so
+    every test starts from the same state.
     """
-    processing_jobs.clear()
+    jobs_before = set(processing_jobs)
     yield
-    processing_jobs.clear()  # Clean up after test
+    # Clean up after test
+    for job_id in list(processing_jobs):
+        if job_id not in jobs_before:
+            del processing_jobs[job_id]
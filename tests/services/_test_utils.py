@@ -0,0 +1,66 @@
+"""
+Shared helpers for the service test scripts.
+
+This module provides the fixture files used by the file handler, download manager
+and Google Drive service tests.
+"""
+
+
+# Minimal ISO base media 'ftyp' box, as found at the start of real MP4 files
+MP4_HEADER = b"\x00\x00\x00\x18ftypisom\x00\x00\x02\x00isomiso2"
+
+# Test file content: kilobyte i is filled with byte i % 256, repeating every 256 KB
+TEST_DATA_PATTERN = memoryview(b"".join(bytes([i]) * 1024 for i in range(256)))
+
+
+def create_test_file(file_path: str, size_kb: int = 100) -> str:
+    """
+    Create a test file of specified size.
+    
+    The directory must already exist; callers create the temporary directories
+    with ensure_temp_dirs() before any test runs.
+    
+    Args:
+        file_path: Path where the file will be created
+        size_kb: Size of the file in KB
+    
+    Returns:
+        Path to the created file
+    """
+    # Create a file with random data
+    with open(file_path, 'wb') as f:
+        # Write size_kb kilobytes of random-like data, up to 256 KB per write
+        for start in range(0, size_kb, 256):
+            f.write(TEST_DATA_PATTERN[:min(256, size_kb - start) * 1024])
+        
+        # Start MP4 files with an 'ftyp' box so they pass signature validation
+        if size_kb and file_path.endswith(".mp4"):
+            f.seek(0)
+            f.write(MP4_HEADER)
+    
+    print(f"Created test file: {file_path} ({size_kb} KB)")
+    return file_path
+
+
+def make_sparse_test_file(file_path: str, size_kb: int = 100) -> str:
+    """
+    Create a sparse test file of specified size, for tests that only check size or age.
+    
+    The file is extended with truncate(), so no data blocks are written regardless
+    of its size. MP4 files still start with an 'ftyp' box. As with create_test_file,
+    the directory must already exist.
+    
+    Args:
+        file_path: Path where the file will be created
+        size_kb: Size of the file in KB
+    
+    Returns:
+        Path to the created file
+    """
+    with open(file_path, 'wb') as f:
+        if size_kb and file_path.endswith(".mp4"):
+            f.write(MP4_HEADER)
+        f.truncate(size_kb * 1024)
+    
+    print(f"Created sparse test file: {file_path} ({size_kb} KB)")
+    return file_path
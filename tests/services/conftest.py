@@ -0,0 +1,14 @@
+import pytest
+
+from app.utils.file_handler import ensure_temp_dirs
+
+
+@pytest.fixture(scope="session", autouse=True)
+def temp_dirs():
+    """
+    Create the temporary download and processing directories once per session.
+    
+    The shared test fixtures write straight into these directories without
+    creating them, as the script runners do by calling ensure_temp_dirs() first.
+    """
+    ensure_temp_dirs()
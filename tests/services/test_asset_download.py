@@ -16,48 +16,75 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from app.services.browser_service import BrowserService
 from app.config import settings
 
-# Sample Frame.io asset URL
-SAMPLE_ASSET_URL = "https://f.io/TafALVxa"  # Replace with a valid Frame.io asset URL
+# Sample Frame.io asset URLs
+SAMPLE_ASSET_URLS = [
+    "https://f.io/TafALVxa",  # Replace with valid Frame.io asset URLs
+]
 
+# Maximum number of assets downloaded at the same time
+MAX_CONCURRENT_DOWNLOADS = 4
 
-async def test_asset_download():
-    """
-    Test the Frame.io asset download functionality.
+
+async def download_asset(asset_url, semaphore):
     """
-    print("Testing Frame.io asset download...")
+    Download a single Frame.io asset and print its details.
     
-    # Create a BrowserService instance
-    browser_service = BrowserService()
+    BrowserService drives a single page, so each download gets its own instance.
     
-    try:
-        # Launch the browser (non-headless for debugging)
-        await browser_service.launch_browser(headless=False)
+    Args:
+        asset_url: Frame.io asset URL to download
+        semaphore: Semaphore bounding the number of concurrent downloads
         
-        # Download the asset
-        download_path = await browser_service.download_frame_io_asset(SAMPLE_ASSET_URL)
+    Returns:
+        True if the asset was downloaded, False otherwise
+    """
+    async with semaphore:
+        # Create a BrowserService instance
+        browser_service = BrowserService()
         
-        if download_path:
-            print(f"Asset download test successful. File saved to: {download_path}")
-            
-            # Get file info
-            file_size = os.path.getsize(download_path)
-            file_name = os.path.basename(download_path)
+        try:
+            # Launch the browser (non-headless for debugging)
+            await browser_service.launch_browser(headless=False)
             
-            print(f"File name: {file_name}")
-            print(f"File size: {file_size} bytes ({file_size / (1024 * 1024):.2f} MB)")
+            # Download the asset
+            download_path = await browser_service.download_frame_io_asset(asset_url)
             
-            return True
-        else:
-            print("Asset download test failed.")
+            if download_path:
+                print(f"Asset download test successful. File saved to: {download_path}")
+                
+                # Get file info
+                file_size = os.path.getsize(download_path)
+                file_name = os.path.basename(download_path)
+                
+                print(f"File name: {file_name}")
+                print(f"File size: {file_size} bytes ({file_size / (1024 * 1024):.2f} MB)")
+                
+                return True
+            else:
+                print(f"Asset download test failed for {asset_url}.")
+                return False
+                
+        except Exception as e:
+            print(f"Error during asset download test for {asset_url}: {e}")
             return False
             
-    except Exception as e:
-        print(f"Error during asset download test: {e}")
-        return False
-        
-    finally:
-        # Close the browser
-        await browser_service.close_browser()
+        finally:
+            # Close the browser
+            await browser_service.close_browser()
+
+
+async def test_asset_download():
+    """
+    Test the Frame.io asset download functionality.
+    
+    Downloads all sample assets concurrently, at most MAX_CONCURRENT_DOWNLOADS at a time.
+    """
+    print("Testing Frame.io asset download...")
+    
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+    results = await asyncio.gather(*(download_asset(url, semaphore) for url in SAMPLE_ASSET_URLS))
+    
+    return all(results)
 
 
 if __name__ == "__main__":
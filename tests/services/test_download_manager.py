@@ -9,8 +9,10 @@ import os
 import sys
 import time
 import asyncio
+import shutil
+import tempfile
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 # Add the project root to the Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -25,29 +27,15 @@ from app.services.download_manager import (
 from app.utils.file_handler import ensure_temp_dirs
 from app.config import settings
 
+# Import the shared test fixtures (package import under pytest, plain when run as a script)
+try:
+    from ._test_utils import create_test_file, make_sparse_test_file
+except ImportError:
+    from _test_utils import create_test_file, make_sparse_test_file
 
-def create_test_file(file_path: str, size_kb: int = 100) -> str:
-    """
-    Create a test file of specified size.
-    
-    Args:
-        file_path: Path where the file will be created
-        size_kb: Size of the file in KB
-        
-    Returns:
-        Path to the created file
-    """
-    # Create the directory if it doesn't exist
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    
-    # Create a file with random data
-    with open(file_path, 'wb') as f:
-        # Write size_kb kilobytes of random-like data
-        for i in range(size_kb):
-            f.write(bytes([i % 256 for _ in range(1024)]))
-    
-    print(f"Created test file: {file_path} ({size_kb} KB)")
-    return file_path
+# Scale factor for the monitoring tests' sleeps, timeouts and progress intervals;
+# the tests only depend on their relative order, not on real durations
+TIME_SCALE = 0.1
 
 
 class ProgressTracker:
@@ -55,35 +43,48 @@ class ProgressTracker:
     
     def __init__(self):
         """Initialize the progress tracker."""
-        self.last_percentage = 0
         self.updates = []
         
     def callback(self, progress_info: Dict[str, Any]) -> None:
         """
         Callback function to receive progress updates.
         
+        Updates are only recorded here; write_summary() prints them afterwards, so
+        nothing is written to stdout from inside the event loop's callbacks.
+        
         Args:
             progress_info: Dictionary with progress information
         """
-        percentage = progress_info.get("percentage", 0)
-        
-        # Only log when percentage changes by at least 5%
-        if int(percentage / 5) > int(self.last_percentage / 5):
-            print(f"Progress: {percentage:.1f}% ({progress_info.get('downloaded_size', 0) / 1024:.1f} KB)")
-            self.updates.append(progress_info)
-            self.last_percentage = percentage
+        self.updates.append(progress_info)
+    
+    def write_summary(self) -> None:
+        """Print the recorded updates in a single write, one line per 5% step."""
+        lines = []
+        last_step = -1
+        for update in self.updates:
+            percentage = update.get("percentage", 0)
+            step = int(percentage / 5)
+            if step > last_step or update is self.updates[-1]:
+                lines.append(
+                    f"Progress: {percentage:.1f}% ({update.get('downloaded_size', 0) / 1024:.1f} KB) "
+                    f"[{update.get('status')}]"
+                )
+                last_step = step
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
 
 
-async def test_progress_tracking():
+async def test_progress_tracking(manager: Optional[DownloadManager] = None):
     """Test the progress tracking functionality."""
     print("\n=== Testing progress tracking ===")
     
-    # Create a download manager
-    manager = DownloadManager()
+    # Fall back to a download manager of its own when run on its own
+    manager = manager or DownloadManager()
     
-    # Create a test file
-    file_path = os.path.join(settings.temp_download_dir, "test_progress.mp4")
-    create_test_file(file_path, 1000)  # 1000 KB
+    # Create a test file in a directory of its own
+    tmpdir = tempfile.mkdtemp(dir=settings.temp_download_dir)
+    file_path = os.path.join(tmpdir, "test_progress.mp4")
+    await asyncio.to_thread(create_test_file, file_path, 1000)  # 1000 KB
     
     try:
         # Register a download
@@ -97,9 +98,6 @@ async def test_progress_tracking():
         tracker = ProgressTracker()
         manager.active_downloads[download_id].add_callback(tracker.callback)
         
-        # Also add the standard print callback
-        manager.active_downloads[download_id].add_callback(print_progress_callback)
-        
         # Simulate download progress
         for i in range(0, 101, 10):
             manager.update_progress(
@@ -107,10 +105,15 @@ async def test_progress_tracking():
                 downloaded_size=int(i * 10 * 1024),  # i * 10 KB
                 status="downloading"
             )
-            await asyncio.sleep(0.1)
+            # Yield to the event loop; the callbacks don't depend on real time
+            await asyncio.sleep(0)
         
         # Mark as completed
         success = manager.mark_completed(download_id, file_path)
+        tracker.write_summary()
+        
+        # Exercise the standard print callback once, with the final update
+        print_progress_callback(tracker.updates[-1])
         
         # Verify results
         assert success, "Download should be marked as completed successfully"
@@ -125,20 +128,20 @@ async def test_progress_tracking():
     except Exception as e:
         print(f"❌ Progress tracking test failed: {e}")
     finally:
-        # Clean up
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        # Clean up the test's directory and everything in it
+        shutil.rmtree(tmpdir, ignore_errors=True)
 
 
-async def test_file_monitoring():
+async def test_file_monitoring(manager: Optional[DownloadManager] = None):
     """Test the file growth monitoring functionality."""
     print("\n=== Testing file monitoring ===")
     
-    # Create a download manager
-    manager = DownloadManager()
+    # Fall back to a download manager of its own when run on its own
+    manager = manager or DownloadManager()
     
-    # Create a test file path (don't create the file yet)
-    file_path = os.path.join(settings.temp_download_dir, "test_monitor.mp4")
+    # Create a test file path in a directory of its own (don't create the file yet)
+    tmpdir = tempfile.mkdtemp(dir=settings.temp_download_dir)
+    file_path = os.path.join(tmpdir, "test_monitor.mp4")
     
     try:
         # Register a download
@@ -148,33 +151,37 @@ async def test_file_monitoring():
             total_size=500 * 1024  # 500 KB
         )
         
-        # Add the standard print callback
-        manager.active_downloads[download_id].add_callback(print_progress_callback)
+        # Record progress updates, printing them once monitoring is done
+        tracker = ProgressTracker()
+        manager.active_downloads[download_id].add_callback(tracker.callback)
         
         # Start monitoring in a separate task
         monitor_task = asyncio.create_task(
             manager.monitor_file_growth(
                 download_id=download_id,
                 file_path=file_path,
-                timeout_seconds=10,  # Short timeout for testing
-                progress_interval=0.5  # Quick updates
+                timeout_seconds=10 * TIME_SCALE,  # Short timeout for testing
+                progress_interval=0.5 * TIME_SCALE  # Quick updates
             )
         )
         
         # Simulate a file being created and growing over time
         # Wait a bit before creating the file
-        await asyncio.sleep(1)
+        await asyncio.sleep(1 * TIME_SCALE)
         
-        # Create the file with initial content
-        create_test_file(file_path, 100)  # 100 KB
+        # Create the file with initial content; the monitor only watches its size
+        make_sparse_test_file(file_path, 100)  # 100 KB
         
-        # Simulate the file growing over time
-        for i in range(2, 6):
-            await asyncio.sleep(1)
-            create_test_file(file_path, i * 100)  # Increase by 100 KB each time
+        # Simulate the file growing over time by extending it in place, through
+        # one open handle rather than resolving the path for every step
+        with open(file_path, 'r+b') as f:
+            for i in range(2, 6):
+                await asyncio.sleep(1 * TIME_SCALE)
+                f.truncate(i * 100 * 1024)  # Increase by 100 KB each time
         
         # Wait for monitoring to detect completion
         success = await monitor_task
+        tracker.write_summary()
         
         # Verify results
         assert success, "File monitoring should succeed"
@@ -185,21 +192,21 @@ async def test_file_monitoring():
     except Exception as e:
         print(f"❌ File monitoring test failed: {e}")
     finally:
-        # Clean up
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        # Clean up the test's directory and everything in it
+        shutil.rmtree(tmpdir, ignore_errors=True)
 
 
-async def test_timeout_handling():
+async def test_timeout_handling(manager: Optional[DownloadManager] = None):
     """Test the timeout handling functionality."""
     print("\n=== Testing timeout handling ===")
     
-    # Create a download manager
-    manager = DownloadManager()
+    # Fall back to a download manager of its own when run on its own
+    manager = manager or DownloadManager()
     
-    # Create a test file
-    file_path = os.path.join(settings.temp_download_dir, "test_timeout.mp4")
-    create_test_file(file_path, 100)  # 100 KB
+    # Create a test file in a directory of its own
+    tmpdir = tempfile.mkdtemp(dir=settings.temp_download_dir)
+    file_path = os.path.join(tmpdir, "test_timeout.mp4")
+    make_sparse_test_file(file_path, 100)  # 100 KB, only its size is checked
     
     try:
         # Register a download with incorrect size
@@ -214,8 +221,8 @@ async def test_timeout_handling():
             manager.monitor_file_growth(
                 download_id=download_id,
                 file_path=file_path,
-                timeout_seconds=3,  # Very short timeout
-                progress_interval=0.5
+                timeout_seconds=3 * TIME_SCALE,  # Very short timeout
+                progress_interval=0.5 * TIME_SCALE
             )
         )
         
@@ -236,25 +243,28 @@ async def test_timeout_handling():
     except Exception as e:
         print(f"❌ Timeout handling test failed: {e}")
     finally:
-        # Clean up
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        # Clean up the test's directory and everything in it
+        shutil.rmtree(tmpdir, ignore_errors=True)
 
 
-async def test_download_verification():
+async def test_download_verification(manager: Optional[DownloadManager] = None):
     """Test the download verification functionality."""
     print("\n=== Testing download verification ===")
     
-    # Create a download manager
-    manager = DownloadManager()
+    # Fall back to a download manager of its own when run on its own
+    manager = manager or DownloadManager()
     
-    # Create test files
-    valid_file = os.path.join(settings.temp_download_dir, "valid_download.mp4")
-    invalid_file = os.path.join(settings.temp_download_dir, "invalid_download.txt")
-    missing_file = os.path.join(settings.temp_download_dir, "missing_download.mp4")
+    # Create test files in a directory of their own
+    tmpdir = tempfile.mkdtemp(dir=settings.temp_download_dir)
+    valid_file = os.path.join(tmpdir, "valid_download.mp4")
+    invalid_file = os.path.join(tmpdir, "invalid_download.txt")
+    missing_file = os.path.join(tmpdir, "missing_download.mp4")
     
-    create_test_file(valid_file, 200)    # 200 KB valid video file
-    create_test_file(invalid_file, 200)  # 200 KB non-video file
+    # Write both files in worker threads so the event loop stays free
+    await asyncio.gather(
+        asyncio.to_thread(create_test_file, valid_file, 200),    # 200 KB valid video file
+        asyncio.to_thread(create_test_file, invalid_file, 200)   # 200 KB non-video file
+    )
     
     try:
         # Test valid file
@@ -294,22 +304,21 @@ async def test_download_verification():
     except Exception as e:
         print(f"❌ Download verification test failed: {e}")
     finally:
-        # Clean up
-        for file_path in [valid_file, invalid_file]:
-            if os.path.exists(file_path):
-                os.remove(file_path)
+        # Clean up the test's directory and everything in it
+        shutil.rmtree(tmpdir, ignore_errors=True)
 
 
-async def test_process_completed_download():
+async def test_process_completed_download(manager: Optional[DownloadManager] = None):
     """Test the process_completed_download functionality."""
     print("\n=== Testing process_completed_download ===")
     
-    # Create a download manager
-    manager = DownloadManager()
+    # Fall back to a download manager of its own when run on its own
+    manager = manager or DownloadManager()
     
-    # Create a test file
-    file_path = os.path.join(settings.temp_download_dir, "test_process.mp4")
-    create_test_file(file_path, 300)  # 300 KB
+    # Create a test file in a directory of its own
+    tmpdir = tempfile.mkdtemp(dir=settings.temp_download_dir)
+    file_path = os.path.join(tmpdir, "test_process.mp4")
+    await asyncio.to_thread(create_test_file, file_path, 300)  # 300 KB
     
     try:
         # Register and complete a download
@@ -339,13 +348,14 @@ async def test_process_completed_download():
     except Exception as e:
         print(f"❌ Process completed download test failed: {e}")
     finally:
-        # Clean up
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        # Clean up the test's directory and everything in it
+        shutil.rmtree(tmpdir, ignore_errors=True)
         
         processing_file = os.path.join(settings.temp_processing_dir, "test_process.mp4")
-        if os.path.exists(processing_file):
-            os.remove(processing_file)
+        try:
+            os.unlink(processing_file)
+        except FileNotFoundError:
+            pass
 
 
 async def run_all_tests():
@@ -355,12 +365,18 @@ async def run_all_tests():
     # Ensure the temporary directories exist
     ensure_temp_dirs()
     
-    # Run tests
-    await test_progress_tracking()
-    await test_file_monitoring()
-    await test_timeout_handling()
-    await test_download_verification()
-    await test_process_completed_download()
+    # Share one download manager between the tests; they use distinct file names,
+    # so their download IDs never collide
+    manager = DownloadManager()
+    
+    # Run tests concurrently, each with its own file paths
+    await asyncio.gather(
+        test_progress_tracking(manager),
+        test_file_monitoring(manager),
+        test_timeout_handling(manager),
+        test_download_verification(manager),
+        test_process_completed_download(manager)
+    )
     
     print("\nAll tests completed.")
 
@@ -374,6 +390,10 @@ if __name__ == "__main__":
         
         settings.temp_download_dir = downloads_dir
         settings.temp_processing_dir = processing_dir
+    elif sys.platform.startswith('linux') and os.path.isdir('/dev/shm'):
+        # Keep test files in RAM-backed tmpfs so fixtures never touch the disk
+        settings.temp_download_dir = '/dev/shm/frameio_test/downloads'
+        settings.temp_processing_dir = '/dev/shm/frameio_test/processing'
     
     # Run all tests
     asyncio.run(run_all_tests())
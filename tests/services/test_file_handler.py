@@ -8,6 +8,9 @@ import os
 import sys
 import time
 import shutil
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add the project root to the Python path
@@ -26,42 +29,34 @@ from app.utils.file_handler import (
 )
 from app.config import settings
 
+# Import the shared test fixtures (package import under pytest, plain when run as a script)
+try:
+    from ._test_utils import create_test_file, make_sparse_test_file
+except ImportError:
+    from _test_utils import create_test_file, make_sparse_test_file
 
-def create_test_file(file_path: str, size_kb: int = 100) -> str:
-    """
-    Create a test file of specified size.
-    
-    Args:
-        file_path: Path where the file will be created
-        size_kb: Size of the file in KB
-        
-    Returns:
-        Path to the created file
-    """
-    # Create the directory if it doesn't exist
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    
-    # Create a file with random data
-    with open(file_path, 'wb') as f:
-        # Write size_kb kilobytes of random-like data
-        for i in range(size_kb):
-            f.write(bytes([i % 256 for _ in range(1024)]))
-    
-    print(f"Created test file: {file_path} ({size_kb} KB)")
-    return file_path
+
+def expected_md5(file_path: str) -> str:
+    """Compute a file's MD5 independently of file_handler, for comparison."""
+    with open(file_path, 'rb') as f:
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11+: hashes straight from the file without Python-level reads
+            return hashlib.file_digest(f, "md5").hexdigest()
+        return hashlib.md5(f.read()).hexdigest()
 
 
 def test_file_info():
     """Test the get_file_info function."""
     print("\n=== Testing get_file_info ===")
     
-    # Create a test file
-    test_file = os.path.join(settings.temp_download_dir, "test_file_info.mp4")
-    create_test_file(test_file, 500)  # 500 KB
+    # Create a test file in a directory of its own
+    tmpdir = tempfile.mkdtemp(dir=settings.temp_download_dir)
+    test_file = os.path.join(tmpdir, "test_file_info.mp4")
+    create_test_file(test_file, 64)  # 64 KB is plenty to check the MD5
     
     try:
         # Get file info
-        file_info = get_file_info(test_file)
+        file_info = get_file_info(test_file, compute_md5=True)
         
         # Print file info
         print(f"File name: {file_info['name']}")
@@ -74,28 +69,28 @@ def test_file_info():
         
         # Validate the results
         assert file_info['name'] == "test_file_info.mp4"
-        assert file_info['size'] == 500 * 1024
+        assert file_info['size'] == 64 * 1024
         assert file_info['extension'] == ".mp4"
         assert file_info['mime_type'] == "video/mp4"
-        assert file_info['md5'] is not None
+        assert file_info['md5'] == expected_md5(test_file)
         
         print("✅ get_file_info test passed")
     except Exception as e:
         print(f"❌ get_file_info test failed: {e}")
     finally:
-        # Clean up
-        if os.path.exists(test_file):
-            os.remove(test_file)
+        # Clean up the test's directory and everything in it
+        shutil.rmtree(tmpdir, ignore_errors=True)
 
 
 def test_validate_video_file():
     """Test the validate_video_file function."""
     print("\n=== Testing validate_video_file ===")
     
-    # Create test files
-    valid_file = os.path.join(settings.temp_download_dir, "valid_video.mp4")
-    invalid_ext = os.path.join(settings.temp_download_dir, "invalid_ext.xyz")
-    empty_file = os.path.join(settings.temp_download_dir, "empty_video.mp4")
+    # Create test files in a directory of their own
+    tmpdir = tempfile.mkdtemp(dir=settings.temp_download_dir)
+    valid_file = os.path.join(tmpdir, "valid_video.mp4")
+    invalid_ext = os.path.join(tmpdir, "invalid_ext.xyz")
+    empty_file = os.path.join(tmpdir, "empty_video.mp4")
     
     create_test_file(valid_file, 500)  # 500 KB
     create_test_file(invalid_ext, 500)  # 500 KB
@@ -126,18 +121,17 @@ def test_validate_video_file():
     except Exception as e:
         print(f"❌ validate_video_file test failed: {e}")
     finally:
-        # Clean up
-        for file_path in [valid_file, invalid_ext, empty_file]:
-            if os.path.exists(file_path):
-                os.remove(file_path)
+        # Clean up the test's directory and everything in it
+        shutil.rmtree(tmpdir, ignore_errors=True)
 
 
 def test_move_to_processing():
     """Test the move_to_processing function."""
     print("\n=== Testing move_to_processing ===")
     
-    # Create a test file
-    test_file = os.path.join(settings.temp_download_dir, "test_move.mp4")
+    # Create a test file in a directory of its own
+    tmpdir = tempfile.mkdtemp(dir=settings.temp_download_dir)
+    test_file = os.path.join(tmpdir, "test_move.mp4")
     create_test_file(test_file, 200)  # 200 KB
     
     try:
@@ -156,13 +150,14 @@ def test_move_to_processing():
     except Exception as e:
         print(f"❌ move_to_processing test failed: {e}")
     finally:
-        # Clean up
-        if os.path.exists(test_file):
-            os.remove(test_file)
+        # Clean up the test's directory and everything in it
+        shutil.rmtree(tmpdir, ignore_errors=True)
         
         processing_file = os.path.join(settings.temp_processing_dir, "test_move.mp4")
-        if os.path.exists(processing_file):
-            os.remove(processing_file)
+        try:
+            os.unlink(processing_file)
+        except FileNotFoundError:
+            pass
 
 
 def test_cleanup_temp_files():
@@ -173,8 +168,9 @@ def test_cleanup_temp_files():
     old_file = os.path.join(settings.temp_download_dir, "old_file.mp4")
     new_file = os.path.join(settings.temp_download_dir, "new_file.mp4")
     
-    create_test_file(old_file, 100)
-    create_test_file(new_file, 100)
+    # Only size and age matter here, so sparse files will do
+    make_sparse_test_file(old_file, 100)
+    make_sparse_test_file(new_file, 100)
     
     # Set the modification time of the old file to 2 days ago
     old_time = time.time() - (2 * 24 * 3600)  # 2 days ago
@@ -208,8 +204,10 @@ def test_cleanup_temp_files():
     finally:
         # Clean up
         for file_path in [old_file, new_file]:
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            try:
+                os.unlink(file_path)
+            except FileNotFoundError:
+                pass
 
 
 def run_all_tests():
@@ -219,10 +217,13 @@ def run_all_tests():
     # Ensure the temporary directories exist
     ensure_temp_dirs()
     
-    # Run tests
-    test_file_info()
-    test_validate_video_file()
-    test_move_to_processing()
+    # Run the independent tests concurrently; each uses its own directory
+    tests = [test_file_info, test_validate_video_file, test_move_to_processing]
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        list(executor.map(lambda test: test(), tests))
+    
+    # The cleanup test counts every file in the temporary directories, so it
+    # runs once the other tests have removed theirs
     test_cleanup_temp_files()
     
     print("\nAll tests completed.")
@@ -237,6 +238,10 @@ if __name__ == "__main__":
         
         settings.temp_download_dir = downloads_dir
         settings.temp_processing_dir = processing_dir
+    elif sys.platform.startswith('linux') and os.path.isdir('/dev/shm'):
+        # Keep test files in RAM-backed tmpfs so fixtures never touch the disk
+        settings.temp_download_dir = '/dev/shm/frameio_test/downloads'
+        settings.temp_processing_dir = '/dev/shm/frameio_test/processing'
     
     # Run tests
     run_all_tests()
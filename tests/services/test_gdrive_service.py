@@ -23,34 +23,16 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from app.utils.file_handler import ensure_temp_dirs, get_file_info
 from app.config import settings
 
+# Import the shared test fixtures (package import under pytest, plain when run as a script)
+try:
+    from ._test_utils import create_test_file
+except ImportError:
+    from _test_utils import create_test_file
+
 # Define the scopes for Google Drive API
 SCOPES = ['https://www.googleapis.com/auth/drive']
 
 
-def create_test_file(file_path: str, size_kb: int = 100) -> str:
-    """
-    Create a test file of specified size.
-    
-    Args:
-        file_path: Path where the file will be created
-        size_kb: Size of the file in KB
-        
-    Returns:
-        Path to the created file
-    """
-    # Create the directory if it doesn't exist
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    
-    # Create a file with random data
-    with open(file_path, 'wb') as f:
-        # Write size_kb kilobytes of random-like data
-        for i in range(size_kb):
-            f.write(bytes([i % 256 for _ in range(1024)]))
-    
-    print(f"Created test file: {file_path} ({size_kb} KB)")
-    return file_path
-
-
 def get_service_account_credentials():
     """
     Get Google Drive service account credentials from file or environment variable.
@@ -7,8 +7,10 @@ using a headless browser.
 
 import os
 import asyncio
+import socket
 import sys
 from pathlib import Path
+from urllib.parse import urlparse
 
 # Add the project root to the Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -20,20 +22,64 @@ from app.config import settings
 # Sample Frame.io asset URL
 SAMPLE_ASSET_URL = "https://next.frame.io/share/ec2520d4-c076-41e6-9ff3-a7d9ed6f2aa7/view/6588ba86-a8c2-4ce9-9962-e0bda4252e0c"
 
+# Headless browser shared by the tests in this module, launched on first use
+_browser_service = None
 
-async def test_headless_download():
+
+async def get_browser_service() -> BrowserService:
+    """
+    Get the module's shared BrowserService, launching it in headless mode on first use.
+    
+    Returns:
+        BrowserService with a running headless browser
+    """
+    global _browser_service
+    
+    if _browser_service is None:
+        browser_service = BrowserService()
+        try:
+            await browser_service.launch_browser(headless=True)
+        except Exception:
+            # Don't leave a half-started browser behind
+            await browser_service.close_browser()
+            raise
+        print("Browser launched in headless mode")
+        _browser_service = browser_service
+    
+    return _browser_service
+
+
+async def close_browser_service() -> None:
+    """Close the shared browser, if one was launched."""
+    global _browser_service
+    
+    if _browser_service is not None:
+        await _browser_service.close_browser()
+        _browser_service = None
+
+
+async def test_headless_download(keep_browser_open: bool = False):
     """
     Test the Frame.io asset download functionality in headless mode.
+    
+    Args:
+        keep_browser_open: Leave the shared browser running for the next test;
+            run_all_tests() then closes it. When run on its own (e.g. by pytest),
+            the test closes the browser itself before its event loop ends.
     """
     print("Testing Frame.io asset download in headless mode...")
     
-    # Create a BrowserService instance
-    browser_service = BrowserService()
+    # Skip straight away when Frame.io can't be reached, rather than launching a
+    # browser only to wait for the download to time out
+    try:
+        socket.create_connection((urlparse(SAMPLE_ASSET_URL).hostname, 443), timeout=2).close()
+    except OSError as e:
+        print(f"Frame.io is unreachable, skipping (no network): {e}")
+        return True
     
     try:
-        # Launch the browser in headless mode
-        await browser_service.launch_browser(headless=True)
-        print("Browser launched in headless mode")
+        # Get the shared headless browser
+        browser_service = await get_browser_service()
         
         # Download the asset
         download_path = await browser_service.download_frame_io_asset(SAMPLE_ASSET_URL)
@@ -58,16 +104,27 @@ async def test_headless_download():
         return False
         
     finally:
-        # Close the browser
-        await browser_service.close_browser()
-        
-        # Give asyncio a chance to clean up resources
-        await asyncio.sleep(0.5)
+        if not keep_browser_open:
+            await close_browser_service()
+
+
+async def run_all_tests() -> bool:
+    """
+    Run all tests, closing the shared browser once they are done.
+    
+    Returns:
+        True if all tests passed, False otherwise
+    """
+    try:
+        return await test_headless_download(keep_browser_open=True)
+    finally:
+        # Close the browser in the event loop it was launched in
+        await close_browser_service()
 
 
 if __name__ == "__main__":
-    # Run the test function
-    success = asyncio.run(test_headless_download())
+    # Run the tests
+    success = asyncio.run(run_all_tests())
     
     # Exit with appropriate status code
     sys.exit(0 if success else 1)
@@ -29,7 +29,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 # Import the modules
 from app.services.browser_service import BrowserService
-from app.utils.file_handler import ensure_temp_dirs, get_file_info
+from app.utils.file_handler import ensure_temp_dirs, get_file_info, validate_video_file
 from app.config import settings
 
 # Configure logging
@@ -42,6 +42,82 @@ logger = logging.getLogger(__name__)
 # Define the scopes for Google Drive API
 SCOPES = ['https://www.googleapis.com/auth/drive']
 
+# Downloaded assets are kept here, one subdirectory per Frame.io asset ID, so
+# repeated runs can skip the browser download
+ASSET_CACHE_DIR = os.path.join(os.path.dirname(settings.temp_download_dir), "asset_cache")
+
+# Set FRAMEIO_TEST_CACHE=0 to always download the asset afresh (e.g. on CI)
+ASSET_CACHE_ENABLED = os.environ.get("FRAMEIO_TEST_CACHE", "1") != "0"
+
+
+def link_or_copy(src: str, dst: str) -> None:
+    """
+    Hard-link a file to a new path, copying it where linking isn't possible.
+    
+    Args:
+        src: Path of the existing file
+        dst: Path to create, replacing any file already there
+    """
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+    
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Across devices, or on filesystems without hard links
+        shutil.copy2(src, dst)
+
+
+def restore_cached_asset(asset_id: str) -> Optional[str]:
+    """
+    Place a previously downloaded copy of an asset in the download directory.
+    
+    Args:
+        asset_id: The Frame.io asset ID
+    
+    Returns:
+        Optional[str]: Path of the file in the download directory, or None if no
+        valid cached copy exists
+    """
+    cache_dir = os.path.join(ASSET_CACHE_DIR, asset_id)
+    try:
+        names = os.listdir(cache_dir)
+    except FileNotFoundError:
+        return None
+    
+    for name in names:
+        cached_path = os.path.join(cache_dir, name)
+        is_valid, error = validate_video_file(cached_path)
+        if not is_valid:
+            logger.warning(f"Ignoring invalid cached asset {cached_path}: {error}")
+            continue
+        
+        download_path = os.path.join(settings.temp_download_dir, name)
+        link_or_copy(cached_path, download_path)
+        return download_path
+    
+    return None
+
+
+def cache_asset(asset_id: str, download_path: str) -> None:
+    """
+    Keep a copy of a downloaded asset for later runs.
+    
+    Args:
+        asset_id: The Frame.io asset ID
+        download_path: Path of the downloaded file
+    """
+    try:
+        cache_dir = os.path.join(ASSET_CACHE_DIR, asset_id)
+        os.makedirs(cache_dir, exist_ok=True)
+        link_or_copy(download_path, os.path.join(cache_dir, os.path.basename(download_path)))
+        logger.info(f"Cached asset {asset_id} in {cache_dir}")
+    except OSError as e:
+        # A failed cache write only costs the next run a fresh download
+        logger.warning(f"Could not cache asset {asset_id}: {e}")
+
 def get_service_account_credentials():
     """
     Get Google Drive service account credentials from file or environment variable.
@@ -188,28 +264,38 @@ async def test_integrated_workflow(frame_io_url: str, folder_name: str) -> Dict[
         results["asset_metadata"]["frameio_id"] = asset_id
         logger.info(f"✅ Successfully extracted asset ID: {asset_id}")
         
-        # Initialize and launch the browser
-        await browser_service.launch_browser(headless=True)
+        # Reuse the asset from an earlier run if it is cached
+        download_path = restore_cached_asset(asset_id) if ASSET_CACHE_ENABLED else None
         
-        # Download asset using browser automation with retry logic
-        max_download_attempts = 3
-        for attempt in range(max_download_attempts):
-            try:
-                logger.info(f"Download attempt {attempt+1}/{max_download_attempts}...")
-                download_path = await browser_service.download_frame_io_asset(frame_io_url)
-                
-                if download_path and os.path.exists(download_path):
-                    break
-                else:
-                    logger.warning(f"Download attempt {attempt+1} failed, retrying...")
-                    time.sleep(2)  # Wait before retry
-            except Exception as e:
-                logger.warning(f"Error during download attempt {attempt+1}: {str(e)}")
-                if attempt < max_download_attempts - 1:
-                    logger.info("Retrying download...")
-                    time.sleep(2)  # Wait before retry
-                else:
-                    logger.error(f"❌ Failed to download after {max_download_attempts} attempts: {str(e)}")
+        if download_path:
+            logger.info(f"Using cached asset, skipping the browser download: {download_path}")
+        else:
+            # Initialize and launch the browser
+            await browser_service.launch_browser(headless=True)
+            
+            # Download asset using browser automation with retry logic
+            max_download_attempts = 3
+            for attempt in range(max_download_attempts):
+                try:
+                    logger.info(f"Download attempt {attempt+1}/{max_download_attempts}...")
+                    download_path = await browser_service.download_frame_io_asset(frame_io_url)
+                    
+                    if download_path and os.path.exists(download_path):
+                        break
+                    else:
+                        logger.warning(f"Download attempt {attempt+1} failed, retrying...")
+                        time.sleep(2)  # Wait before retry
+                except Exception as e:
+                    logger.warning(f"Error during download attempt {attempt+1}: {str(e)}")
+                    if attempt < max_download_attempts - 1:
+                        logger.info("Retrying download...")
+                        time.sleep(2)  # Wait before retry
+                    else:
+                        logger.error(f"❌ Failed to download after {max_download_attempts} attempts: {str(e)}")
+            
+            # Keep the download for the next run
+            if ASSET_CACHE_ENABLED and download_path and os.path.exists(download_path):
+                cache_asset(asset_id, download_path)
         
         if not download_path or not os.path.exists(download_path):
             logger.error("❌ Failed to download asset from Frame.io")